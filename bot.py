@@ -2,9 +2,18 @@
 
 import logging
 
-from telegram.ext import Application
+try:
+    # Drop-in libuv event loop — noticeably faster for this I/O-bound
+    # workload (asyncpg + two HTTPS APIs). Linux/macOS only.
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
-from config import TELEGRAM_BOT_TOKEN, SUPER_ADMIN_USERNAME
+from telegram.ext import AIORateLimiter, Application
+
+from config import TELEGRAM_BOT_TOKEN, SUPER_ADMIN_USERNAME, REDIS_URL
+import claude_ai
 import db
 from handlers import register_handlers
 
@@ -20,28 +29,37 @@ async def post_init(app: Application) -> None:
     await db.init_db()
     logger.info("DB pool ready")
 
-    # Bootstrap: ensure the first super-admin exists
+    # Bootstrap: ensure the first super-admin exists (one conditional UPDATE)
     if SUPER_ADMIN_USERNAME:
-        user = await db.get_user_by_username(SUPER_ADMIN_USERNAME)
-        if user and user.role.value != "super_admin":
-            await db.set_user_role(SUPER_ADMIN_USERNAME, db.UserRole.SUPER_ADMIN)
+        if await db.ensure_super_admin(SUPER_ADMIN_USERNAME):
             logger.info("Set %s as super_admin", SUPER_ADMIN_USERNAME)
 
 
 async def post_shutdown(app: Application) -> None:
-    """Called when the Application shuts down — close DB pool."""
+    """Called when the Application shuts down — close DB pool and HTTP client."""
     await db.close_db()
+    await claude_ai.aclose()
     logger.info("DB pool closed")
 
 
 def main() -> None:
-    app = (
+    builder = (
         Application.builder()
         .token(TELEGRAM_BOT_TOKEN)
+        # Process updates concurrently — otherwise one slow handler
+        # (Claude, Sheets) stalls every other user's update
+        .concurrent_updates(True)
+        # Queue outgoing Bot API calls under Telegram's flood limits
+        .rate_limiter(AIORateLimiter())
         .post_init(post_init)
         .post_shutdown(post_shutdown)
-        .build()
     )
+    if REDIS_URL:
+        # Optional: share conversation state across workers/restarts
+        from redis_persistence import RedisPersistence
+
+        builder = builder.persistence(RedisPersistence(REDIS_URL))
+    app = builder.build()
 
     register_handlers(app)
 
@@ -2,17 +2,43 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 
 import anthropic
+import httpx
+import orjson
+from aiolimiter import AsyncLimiter
 
 from config import CLAUDE_API_KEY, CLAUDE_MODEL
 import db
+import semantic_cache
 
 logger = logging.getLogger(__name__)
 
-client = anthropic.AsyncAnthropic(api_key=CLAUDE_API_KEY)
+# Explicit HTTPX client: HTTP/2 multiplexes concurrent requests over a few
+# kept-alive TLS connections instead of paying a handshake per burst.
+_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(
+        max_connections=64,
+        max_keepalive_connections=32,
+        keepalive_expiry=60.0,
+    ),
+    timeout=60.0,
+)
+
+client = anthropic.AsyncAnthropic(api_key=CLAUDE_API_KEY, http_client=_http_client)
+
+# Shape outbound Claude traffic to stay under the account's RPM limit —
+# bursting past it triggers 429s whose retries only compound the overload.
+_anthropic_limiter = AsyncLimiter(max_rate=45, time_period=60)
+_anthropic_sem = asyncio.Semaphore(8)
+
+
+async def aclose() -> None:
+    """Close the shared HTTP client — called from the bot's shutdown hook."""
+    await _http_client.aclose()
 
 # ---------------------------------------------------------------------------
 # User Q&A
@@ -26,22 +52,85 @@ SOLOMON_SYSTEM = """Ты — Соломон, дружелюбный помощн
 Если не знаешь ответа, вежливо скажи, что не можешь помочь, и предложи обратиться к служителям."""
 
 
-async def answer_user_question(message: str, user_name: str) -> str:
-    """Answer a free-text user question using DB context."""
+def _cached_system_blocks(*texts: str) -> list[dict]:
+    """Build a `system` block list with prompt-caching markers.
+
+    Each block is marked `cache_control: ephemeral`, so Anthropic caches the
+    stable prefix (system prompt + DB context) and bills cached tokens at a
+    fraction of the normal rate while skipping prefill on repeat calls.
+    Dynamic per-call text must go in a separate, unmarked trailing block.
+    """
+    return [
+        {"type": "text", "text": t, "cache_control": {"type": "ephemeral"}}
+        for t in texts
+    ]
+
+
+def _with_cache_markers(messages: list[dict]) -> list[dict]:
+    """Mark the last two user messages with `cache_control: ephemeral`.
+
+    With a sliding pair of cache checkpoints Anthropic reads from the older
+    one and writes a new one each turn, so once conversation history is
+    threaded through, most of it stays cached instead of being re-prefilled.
+    Converts marked `content` strings to the list-of-blocks form in place.
+    """
+    marked = 0
+    for msg in reversed(messages):
+        if msg.get("role") != "user":
+            continue
+        content = msg["content"]
+        if isinstance(content, str):
+            content = [{"type": "text", "text": content}]
+            msg["content"] = content
+        content[-1]["cache_control"] = {"type": "ephemeral"}
+        marked += 1
+        if marked == 2:
+            break
+    return messages
+
+
+async def stream_user_answer(message: str):
+    """Yield the answer to a user question incrementally as Claude streams it.
+
+    First-token latency is a fraction of full-generation latency, so the
+    caller can show partial text long before the response completes. On a
+    semantic-cache hit the whole cached answer is yielded at once. The
+    prompt deliberately carries no user identity: answers are cached and
+    served across users, so they must not address anyone by name.
+    """
     context = await db.get_claude_context()
+
+    # Near-duplicate questions are answered from the local cache without a
+    # Claude round-trip. Namespaced by context, so DB edits invalidate it.
+    cache_ns = semantic_cache.namespace_for(context)
+    cached = semantic_cache.get(message, cache_ns)
+    if cached is not None:
+        yield cached
+        return
+
     try:
-        resp = await client.messages.create(
-            model=CLAUDE_MODEL,
-            max_tokens=1024,
-            system=SOLOMON_SYSTEM + "\n\n" + context,
-            messages=[
-                {"role": "user", "content": f"[{user_name}]: {message}"},
-            ],
-        )
-        return resp.content[0].text
+        async with _anthropic_limiter, _anthropic_sem:
+            async with client.messages.stream(
+                model=CLAUDE_MODEL,
+                max_tokens=1024,
+                system=_cached_system_blocks(SOLOMON_SYSTEM, context),
+                messages=_with_cache_markers([
+                    {"role": "user", "content": message},
+                ]),
+            ) as stream:
+                parts = []
+                async for text in stream.text_stream:
+                    parts.append(text)
+                    yield text
+        semantic_cache.put(message, cache_ns, "".join(parts))
     except Exception:
         logger.exception("Claude API error")
-        return "Извините, произошла ошибка при обработке запроса."
+        yield "Извините, произошла ошибка при обработке запроса."
+
+
+async def answer_user_question(message: str) -> str:
+    """Answer a free-text user question using DB context (non-streaming)."""
+    return "".join([chunk async for chunk in stream_user_answer(message)])
 
 
 # ---------------------------------------------------------------------------
@@ -87,23 +176,29 @@ async def parse_admin_command(
     """Parse a free-text admin command using Claude. Returns dict with action/params."""
     tables_str = ", ".join(admin_tables) if admin_tables else "все"
     try:
-        resp = await client.messages.create(
-            model=CLAUDE_MODEL,
-            max_tokens=1024,
-            system=(
-                ADMIN_SYSTEM
-                + f"\n\nАдмин: @{admin_username}, доступ к таблицам: {tables_str}"
-            ),
-            messages=[{"role": "user", "content": text}],
-        )
+        async with _anthropic_limiter, _anthropic_sem:
+            resp = await client.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=1024,
+                system=[
+                    # Static prompt is cached; the per-admin tail is a separate
+                    # unmarked block so the cached prefix hash is admin-independent.
+                    *_cached_system_blocks(ADMIN_SYSTEM),
+                    {
+                        "type": "text",
+                        "text": f"Админ: @{admin_username}, доступ к таблицам: {tables_str}",
+                    },
+                ],
+                messages=_with_cache_markers([{"role": "user", "content": text}]),
+            )
         raw = resp.content[0].text.strip()
         # Strip possible markdown code fence
         if raw.startswith("```"):
             raw = raw.split("\n", 1)[1]
             if raw.endswith("```"):
                 raw = raw[:-3]
-        return json.loads(raw)
-    except (json.JSONDecodeError, IndexError, KeyError):
+        return orjson.loads(raw)
+    except (orjson.JSONDecodeError, IndexError, KeyError):
         logger.exception("Failed to parse Claude admin response")
         return {
             "action": "unknown",
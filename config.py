@@ -13,6 +13,9 @@ DATABASE_URL = os.environ["DATABASE_URL"]
 GOOGLE_SHEETS_ID = os.getenv("GOOGLE_SHEETS_ID", "")
 GOOGLE_CREDENTIALS_JSON = os.getenv("GOOGLE_CREDENTIALS_JSON", "")
 
+# Redis (optional — shared conversation state across workers/restarts)
+REDIS_URL = os.getenv("REDIS_URL", "")
+
 # First super-admin username (without @), set once on first deploy
 SUPER_ADMIN_USERNAME = os.getenv("SUPER_ADMIN_USERNAME", "")
 
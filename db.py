@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import time
 import logging
 from typing import Optional
 
 import asyncpg
+import orjson
 
 from config import DATABASE_URL
 from models import (
@@ -19,6 +20,12 @@ logger = logging.getLogger(__name__)
 
 pool: Optional[asyncpg.Pool] = None
 
+# Value → member maps so row mappers do one dict lookup per row instead of
+# going through Enum.__call__ — noticeable in loops over large result sets.
+_USER_ROLE_MAP = {r.value: r for r in UserRole}
+_EVENT_STATUS_MAP = {s.value: s for s in EventStatus}
+_REQUEST_STATUS_MAP = {s.value: s for s in RequestStatus}
+
 # ---------------------------------------------------------------------------
 # DDL — idempotent schema creation
 # ---------------------------------------------------------------------------
@@ -169,6 +176,20 @@ CREATE TABLE IF NOT EXISTS notification_settings (
     last_sent     TIMESTAMPTZ,
     UNIQUE (username, table_name)
 );
+
+-- Indexes for the hot WHERE clauses (Claude context + admin flows)
+CREATE INDEX IF NOT EXISTS events_status_date_idx
+    ON events (status, date_start);
+CREATE INDEX IF NOT EXISTS events_active_idx
+    ON events (date_start) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS admin_requests_pending_idx
+    ON admin_requests (created_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS info_category_idx
+    ON info (category, id);
+CREATE INDEX IF NOT EXISTS users_super_admin_idx
+    ON users (telegram_id) WHERE role = 'super_admin';
+CREATE INDEX IF NOT EXISTS admin_table_access_user_idx
+    ON admin_table_access (username);
 """
 
 
@@ -176,12 +197,48 @@ CREATE TABLE IF NOT EXISTS notification_settings (
 # Pool lifecycle
 # ---------------------------------------------------------------------------
 
+async def _init_conn(conn: asyncpg.Connection) -> None:
+    """Per-connection setup: decode/encode JSONB with orjson at the driver.
+
+    With the codec registered, payload_json arrives as a dict and dicts can
+    be passed straight to INSERT parameters — no json.loads/dumps in Python
+    per row, and orjson's C implementation does the (de)serialization.
+    """
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=lambda v: orjson.dumps(v).decode(),
+        decoder=orjson.loads,
+        schema="pg_catalog",
+    )
+
+
 async def init_db() -> None:
     """Create the connection pool and run DDL."""
     global pool
-    pool = await asyncpg.create_pool(DATABASE_URL, min_size=2, max_size=10)
+    # Every query in this module is a constant SQL literal, so asyncpg's
+    # per-connection prepared-statement LRU caches them all: after first
+    # use on a connection, calls skip parse/plan entirely. Size the cache
+    # well above our statement count so nothing ever gets evicted.
+    pool = await asyncpg.create_pool(
+        DATABASE_URL,
+        min_size=2,
+        max_size=20,
+        max_inactive_connection_lifetime=300,
+        statement_cache_size=1024,
+        init=_init_conn,
+    )
     async with pool.acquire() as conn:
         await conn.execute(SCHEMA_SQL)
+        # Hydrate the per-event registration counter once — after this,
+        # capacity checks never touch SQL (see count_event_registrations).
+        _REG_COUNT.clear()
+        _REG_COUNT.update({
+            r["event_id"]: r["count"]
+            for r in await conn.fetch(
+                "SELECT event_id, count(*) FROM event_registrations "
+                "GROUP BY event_id"
+            )
+        })
     logger.info("Database initialised")
 
 
@@ -198,6 +255,9 @@ async def close_db() -> None:
 # Users
 # ---------------------------------------------------------------------------
 
+_USER_COLS = "telegram_id, username, full_name, phone, role, created_at"
+
+
 async def upsert_user(
     telegram_id: int,
     username: Optional[str],
@@ -205,44 +265,66 @@ async def upsert_user(
     phone: Optional[str] = None,
 ) -> User:
     row = await pool.fetchrow(
-        """
+        f"""
         INSERT INTO users (telegram_id, username, full_name, phone)
         VALUES ($1, $2, $3, $4)
         ON CONFLICT (telegram_id) DO UPDATE
             SET username  = COALESCE(EXCLUDED.username, users.username),
                 full_name = EXCLUDED.full_name
-        RETURNING *
+        RETURNING {_USER_COLS}
         """,
         telegram_id, username, full_name, phone,
     )
+    import roles  # function-level: roles imports db at module scope
+
+    roles.invalidate(telegram_id)
     return _row_to_user(row)
 
 
 async def get_user(telegram_id: int) -> Optional[User]:
     row = await pool.fetchrow(
-        "SELECT * FROM users WHERE telegram_id = $1", telegram_id,
+        f"SELECT {_USER_COLS} FROM users WHERE telegram_id = $1", telegram_id,
     )
     return _row_to_user(row) if row else None
 
 
 async def get_user_by_username(username: str) -> Optional[User]:
     row = await pool.fetchrow(
-        "SELECT * FROM users WHERE username = $1", username,
+        f"SELECT {_USER_COLS} FROM users WHERE username = $1", username,
     )
     return _row_to_user(row) if row else None
 
 
 async def set_user_role(username: str, role: UserRole) -> bool:
-    tag = await pool.execute(
-        "UPDATE users SET role = $1 WHERE username = $2",
+    telegram_id = await pool.fetchval(
+        "UPDATE users SET role = $1 WHERE username = $2 RETURNING telegram_id",
         role.value, username,
     )
-    return tag == "UPDATE 1"
+    if telegram_id is None:
+        return False
+    import roles
+
+    roles.invalidate(telegram_id)
+    return True
+
+
+async def iter_all_users(prefetch: int = 256):
+    """Stream all users via a server-side cursor, without loading the table.
+
+    Prefer this over get_all_users for exports and fan-out flows — memory
+    stays bounded by *prefetch* rows and decoding overlaps the network.
+    """
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            async for r in conn.cursor(
+                f"SELECT {_USER_COLS} FROM users ORDER BY created_at",
+                prefetch=prefetch,
+            ):
+                yield _row_to_user(r)
 
 
 async def get_all_users() -> list[User]:
-    rows = await pool.fetch("SELECT * FROM users ORDER BY created_at")
-    return [_row_to_user(r) for r in rows]
+    return [u async for u in iter_all_users()]
 
 
 def _row_to_user(row: asyncpg.Record) -> User:
@@ -251,7 +333,7 @@ def _row_to_user(row: asyncpg.Record) -> User:
         username=row["username"],
         full_name=row["full_name"],
         phone=row["phone"],
-        role=UserRole(row["role"]),
+        role=_USER_ROLE_MAP[row["role"]],
         created_at=row["created_at"],
     )
 
@@ -260,6 +342,12 @@ def _row_to_user(row: asyncpg.Record) -> User:
 # Events
 # ---------------------------------------------------------------------------
 
+_EVENT_COLS = (
+    "id, title, type, date_start, date_end, time, place, "
+    "description, max_participants, status, created_by, created_at"
+)
+
+
 async def create_event(
     title: str,
     date_start,
@@ -274,52 +362,92 @@ async def create_event(
     created_by: Optional[str] = None,
 ) -> Event:
     row = await pool.fetchrow(
-        """
+        f"""
         INSERT INTO events
             (title, type, date_start, date_end, time, place,
              description, max_participants, status, created_by)
         VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10)
-        RETURNING *
+        RETURNING {_EVENT_COLS}
         """,
         title, type, date_start, date_end, time, place,
         description, max_participants, status.value, created_by,
     )
+    _invalidate_context_cache()
     return _row_to_event(row)
 
 
 async def get_active_events() -> list[Event]:
     rows = await pool.fetch(
-        "SELECT * FROM events WHERE status = 'active' ORDER BY date_start",
+        f"SELECT {_EVENT_COLS} FROM events WHERE status = 'active' ORDER BY date_start",
     )
     return [_row_to_event(r) for r in rows]
 
 
 async def get_events_by_status(status: EventStatus) -> list[Event]:
     rows = await pool.fetch(
-        "SELECT * FROM events WHERE status = $1 ORDER BY date_start",
+        f"SELECT {_EVENT_COLS} FROM events WHERE status = $1 ORDER BY date_start",
         status.value,
     )
     return [_row_to_event(r) for r in rows]
 
 
+async def get_events_by_statuses(statuses: list[EventStatus]) -> list[Event]:
+    """Fetch events in any of the given statuses in one query, pending first."""
+    rows = await pool.fetch(
+        f"""
+        SELECT {_EVENT_COLS} FROM events
+        WHERE status = ANY($1)
+        ORDER BY (status = 'pending') DESC, date_start, id
+        """,
+        [s.value for s in statuses],
+    )
+    return [_row_to_event(r) for r in rows]
+
+
 async def get_event(event_id: int) -> Optional[Event]:
-    row = await pool.fetchrow("SELECT * FROM events WHERE id = $1", event_id)
+    row = await pool.fetchrow(f"SELECT {_EVENT_COLS} FROM events WHERE id = $1", event_id)
     return _row_to_event(row) if row else None
 
 
+async def get_event_with_count(event_id: int) -> Optional[tuple[Event, int]]:
+    """Fetch an event and its registration count in a single round-trip."""
+    row = await pool.fetchrow(
+        f"""
+        SELECT {_EVENT_COLS},
+               (SELECT COUNT(*) FROM event_registrations
+                WHERE event_id = events.id) AS reg_count
+        FROM events WHERE id = $1
+        """,
+        event_id,
+    )
+    return (_row_to_event(row), row["reg_count"]) if row else None
+
+
+# Updatable event columns. One statically built statement per column, so
+# every update runs constant SQL (cached by asyncpg, planned once) and an
+# unexpected kwarg can never reach the query text.
+_EVENT_UPDATE_COLS = frozenset({
+    "title", "type", "date_start", "date_end", "time", "place",
+    "description", "max_participants", "status",
+})
+_EVENT_UPDATE_SQL = {
+    col: f"UPDATE events SET {col} = $1 WHERE id = $2 RETURNING {_EVENT_COLS}"
+    for col in _EVENT_UPDATE_COLS
+}
+
+
 async def update_event(event_id: int, **fields) -> Optional[Event]:
     if not fields:
         return await get_event(event_id)
-    sets = []
-    vals = []
-    for i, (k, v) in enumerate(fields.items(), 1):
-        sets.append(f"{k} = ${i}")
-        vals.append(v)
-    vals.append(event_id)
-    row = await pool.fetchrow(
-        f"UPDATE events SET {', '.join(sets)} WHERE id = ${len(vals)} RETURNING *",
-        *vals,
-    )
+    unknown = fields.keys() - _EVENT_UPDATE_COLS
+    if unknown:
+        raise ValueError(f"Unknown event column(s): {', '.join(sorted(unknown))}")
+    row = None
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            for col, val in fields.items():
+                row = await conn.fetchrow(_EVENT_UPDATE_SQL[col], val, event_id)
+    _invalidate_context_cache()
     return _row_to_event(row) if row else None
 
 
@@ -333,6 +461,7 @@ async def archive_event(event_id: int) -> Optional[Event]:
 
 async def delete_event(event_id: int) -> bool:
     tag = await pool.execute("DELETE FROM events WHERE id = $1", event_id)
+    _invalidate_context_cache()
     return tag == "DELETE 1"
 
 
@@ -347,7 +476,7 @@ def _row_to_event(row: asyncpg.Record) -> Event:
         place=row["place"],
         description=row["description"],
         max_participants=row["max_participants"],
-        status=EventStatus(row["status"]),
+        status=_EVENT_STATUS_MAP[row["status"]],
         created_by=row["created_by"],
         created_at=row["created_at"],
     )
@@ -357,6 +486,18 @@ def _row_to_event(row: asyncpg.Record) -> Event:
 # Event registrations
 # ---------------------------------------------------------------------------
 
+_REG_COLS = (
+    "id, event_id, username, telegram_id, full_name, "
+    "phone, level, comment, registered_at"
+)
+
+# Process-local registration counter, hydrated in init_db and maintained
+# by register_for_event / register_for_event_many. Capacity checks on the
+# "Register" button are the hottest read in the bot; serving them from
+# this dict turns a COUNT(*) round-trip into a dict lookup.
+_REG_COUNT: dict[int, int] = {}
+
+
 async def register_for_event(
     event_id: int,
     full_name: str,
@@ -368,7 +509,7 @@ async def register_for_event(
     comment: Optional[str] = None,
 ) -> EventRegistration:
     row = await pool.fetchrow(
-        """
+        f"""
         INSERT INTO event_registrations
             (event_id, username, telegram_id, full_name, phone, level, comment)
         VALUES ($1,$2,$3,$4,$5,$6,$7)
@@ -377,25 +518,73 @@ async def register_for_event(
                 phone     = EXCLUDED.phone,
                 level     = EXCLUDED.level,
                 comment   = EXCLUDED.comment
-        RETURNING *
+        RETURNING {_REG_COLS}, (xmax = 0) AS _inserted
         """,
         event_id, username, telegram_id, full_name, phone, level, comment,
     )
+    if row["_inserted"]:
+        # Only count genuinely new rows — the upsert path re-registering
+        # the same user must not inflate the counter.
+        _REG_COUNT[event_id] = _REG_COUNT.get(event_id, 0) + 1
     return _row_to_registration(row)
 
 
+async def register_for_event_many(
+    event_id: int,
+    regs: list[EventRegistration],
+) -> int:
+    """Bulk-insert registrations for one event via the Postgres COPY path.
+
+    One round-trip regardless of batch size — intended for admin-driven
+    imports where looping register_for_event would cost one RTT per row.
+    Unlike register_for_event there is no upsert: a duplicate
+    (event_id, telegram_id) pair raises. Returns the number of rows copied.
+    """
+    if not regs:
+        return 0
+    async with pool.acquire() as conn:
+        await conn.copy_records_to_table(
+            "event_registrations",
+            records=[
+                (event_id, r.username, r.telegram_id, r.full_name,
+                 r.phone, r.level, r.comment)
+                for r in regs
+            ],
+            columns=[
+                "event_id", "username", "telegram_id", "full_name",
+                "phone", "level", "comment",
+            ],
+        )
+    _REG_COUNT[event_id] = _REG_COUNT.get(event_id, 0) + len(regs)
+    return len(regs)
+
+
+async def iter_event_registrations(event_id: int, prefetch: int = 256):
+    """Stream one event's registrations via a server-side cursor."""
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            async for r in conn.cursor(
+                f"SELECT {_REG_COLS} FROM event_registrations "
+                "WHERE event_id = $1 ORDER BY registered_at",
+                event_id,
+                prefetch=prefetch,
+            ):
+                yield _row_to_registration(r)
+
+
 async def get_event_registrations(event_id: int) -> list[EventRegistration]:
-    rows = await pool.fetch(
-        "SELECT * FROM event_registrations WHERE event_id = $1 ORDER BY registered_at",
-        event_id,
-    )
-    return [_row_to_registration(r) for r in rows]
+    return [r async for r in iter_event_registrations(event_id)]
 
 
 async def count_event_registrations(event_id: int) -> int:
-    return await pool.fetchval(
-        "SELECT count(*) FROM event_registrations WHERE event_id = $1", event_id,
-    )
+    count = _REG_COUNT.get(event_id)
+    if count is None:
+        count = await pool.fetchval(
+            "SELECT count(*) FROM event_registrations WHERE event_id = $1",
+            event_id,
+        )
+        _REG_COUNT[event_id] = count
+    return count
 
 
 def _row_to_registration(row: asyncpg.Record) -> EventRegistration:
@@ -417,41 +606,63 @@ def _row_to_registration(row: asyncpg.Record) -> EventRegistration:
 # ---------------------------------------------------------------------------
 
 async def create_info(category: str, title: str, content: str) -> int:
-    return await pool.fetchval(
+    info_id = await pool.fetchval(
         "INSERT INTO info (category, title, content) VALUES ($1,$2,$3) RETURNING id",
         category, title, content,
     )
+    _invalidate_context_cache()
+    return info_id
+
+
+_INFO_UPDATE_COLS = frozenset({"category", "title", "content"})
+_INFO_UPDATE_SQL = {
+    col: f"UPDATE info SET {col} = $1, updated_at = now() WHERE id = $2"
+    for col in _INFO_UPDATE_COLS
+}
 
 
 async def update_info(info_id: int, **fields) -> bool:
     if not fields:
         return False
-    sets = []
-    vals = []
-    for i, (k, v) in enumerate(fields.items(), 1):
-        sets.append(f"{k} = ${i}")
-        vals.append(v)
-    vals.append(info_id)
-    tag = await pool.execute(
-        f"UPDATE info SET {', '.join(sets)}, updated_at = now() WHERE id = ${len(vals)}",
-        *vals,
-    )
+    unknown = fields.keys() - _INFO_UPDATE_COLS
+    if unknown:
+        raise ValueError(f"Unknown info column(s): {', '.join(sorted(unknown))}")
+    tag = ""
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            for col, val in fields.items():
+                tag = await conn.execute(_INFO_UPDATE_SQL[col], val, info_id)
+    _invalidate_context_cache()
     return tag == "UPDATE 1"
 
 
 async def delete_info(info_id: int) -> bool:
     tag = await pool.execute("DELETE FROM info WHERE id = $1", info_id)
+    _invalidate_context_cache()
     return tag == "DELETE 1"
 
 
+_INFO_COLS = "id, category, title, content, updated_at"
+
+
+async def iter_all_info(prefetch: int = 256):
+    """Stream all info rows (as dicts) via a server-side cursor."""
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            async for r in conn.cursor(
+                f"SELECT {_INFO_COLS} FROM info ORDER BY category, id",
+                prefetch=prefetch,
+            ):
+                yield dict(r)
+
+
 async def get_all_info() -> list[dict]:
-    rows = await pool.fetch("SELECT * FROM info ORDER BY category, id")
-    return [dict(r) for r in rows]
+    return [i async for i in iter_all_info()]
 
 
 async def get_info_by_category(category: str) -> list[dict]:
     rows = await pool.fetch(
-        "SELECT * FROM info WHERE category = $1 ORDER BY id", category,
+        f"SELECT {_INFO_COLS} FROM info WHERE category = $1 ORDER BY id", category,
     )
     return [dict(r) for r in rows]
 
@@ -460,6 +671,13 @@ async def get_info_by_category(category: str) -> list[dict]:
 # Admin requests
 # ---------------------------------------------------------------------------
 
+_REQUEST_COLS = (
+    "id, username, telegram_id, full_name, phone, requested_table, "
+    "request_type, payload_json, comment, status, reviewed_by, "
+    "created_at, reviewed_at"
+)
+
+
 async def create_admin_request(
     username: str,
     request_type: str,
@@ -472,16 +690,16 @@ async def create_admin_request(
     comment: Optional[str] = None,
 ) -> AdminRequest:
     row = await pool.fetchrow(
-        """
+        f"""
         INSERT INTO admin_requests
             (username, telegram_id, full_name, phone,
              requested_table, request_type, payload_json, comment)
         VALUES ($1,$2,$3,$4,$5,$6,$7,$8)
-        RETURNING *
+        RETURNING {_REQUEST_COLS}
         """,
         username, telegram_id, full_name, phone,
         requested_table, request_type,
-        json.dumps(payload_json) if payload_json else None,
+        payload_json,
         comment,
     )
     return _row_to_request(row)
@@ -489,25 +707,25 @@ async def create_admin_request(
 
 async def get_pending_requests() -> list[AdminRequest]:
     rows = await pool.fetch(
-        "SELECT * FROM admin_requests WHERE status = 'pending' ORDER BY created_at",
+        f"SELECT {_REQUEST_COLS} FROM admin_requests WHERE status = 'pending' ORDER BY created_at",
     )
     return [_row_to_request(r) for r in rows]
 
 
 async def get_request(request_id: int) -> Optional[AdminRequest]:
     row = await pool.fetchrow(
-        "SELECT * FROM admin_requests WHERE id = $1", request_id,
+        f"SELECT {_REQUEST_COLS} FROM admin_requests WHERE id = $1", request_id,
     )
     return _row_to_request(row) if row else None
 
 
 async def approve_request(request_id: int, reviewed_by: str) -> Optional[AdminRequest]:
     row = await pool.fetchrow(
-        """
+        f"""
         UPDATE admin_requests
         SET status = 'approved', reviewed_by = $1, reviewed_at = now()
         WHERE id = $2 AND status = 'pending'
-        RETURNING *
+        RETURNING {_REQUEST_COLS}
         """,
         reviewed_by, request_id,
     )
@@ -516,11 +734,11 @@ async def approve_request(request_id: int, reviewed_by: str) -> Optional[AdminRe
 
 async def reject_request(request_id: int, reviewed_by: str) -> Optional[AdminRequest]:
     row = await pool.fetchrow(
-        """
+        f"""
         UPDATE admin_requests
         SET status = 'rejected', reviewed_by = $1, reviewed_at = now()
         WHERE id = $2 AND status = 'pending'
-        RETURNING *
+        RETURNING {_REQUEST_COLS}
         """,
         reviewed_by, request_id,
     )
@@ -528,9 +746,6 @@ async def reject_request(request_id: int, reviewed_by: str) -> Optional[AdminReq
 
 
 def _row_to_request(row: asyncpg.Record) -> AdminRequest:
-    pj = row["payload_json"]
-    if isinstance(pj, str):
-        pj = json.loads(pj)
     return AdminRequest(
         id=row["id"],
         username=row["username"],
@@ -539,9 +754,9 @@ def _row_to_request(row: asyncpg.Record) -> AdminRequest:
         full_name=row["full_name"],
         phone=row["phone"],
         requested_table=row["requested_table"],
-        payload_json=pj,
+        payload_json=row["payload_json"],
         comment=row["comment"],
-        status=RequestStatus(row["status"]),
+        status=_REQUEST_STATUS_MAP[row["status"]],
         reviewed_by=row["reviewed_by"],
         created_at=row["created_at"],
         reviewed_at=row["reviewed_at"],
@@ -562,6 +777,36 @@ async def grant_table_access(username: str, table_name: str) -> None:
     )
 
 
+async def grant_admin(username: str, table_name: Optional[str] = None) -> bool:
+    """Promote *username* to admin and optionally grant a table, atomically.
+
+    One connection, one transaction — an approval either fully applies or
+    not at all, and the role + grant cost a single pool acquire instead
+    of two. Returns False if the user does not exist.
+    """
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            telegram_id = await conn.fetchval(
+                "UPDATE users SET role = $1 WHERE username = $2 "
+                "RETURNING telegram_id",
+                UserRole.ADMIN.value, username,
+            )
+            if telegram_id is None:
+                return False
+            if table_name:
+                await conn.execute(
+                    """
+                    INSERT INTO admin_table_access (username, table_name)
+                    VALUES ($1, $2) ON CONFLICT DO NOTHING
+                    """,
+                    username, table_name,
+                )
+    import roles
+
+    roles.invalidate(telegram_id)
+    return True
+
+
 async def get_admin_tables(username: str) -> list[str]:
     rows = await pool.fetch(
         "SELECT table_name FROM admin_table_access WHERE username = $1",
@@ -574,39 +819,87 @@ async def get_admin_tables(username: str) -> list[str]:
 # Claude context (cached)
 # ---------------------------------------------------------------------------
 
-_context_cache: dict = {"data": None, "ts": 0.0}
-_CACHE_TTL = 60  # seconds
+# Plain module globals (attribute loads, no dict hashing) and a monotonic
+# clock, which cannot jump backwards the way wall-clock time can.
+_ctx_data: Optional[str] = None
+_ctx_ts: float = 0.0
+_CACHE_TTL = 60.0  # seconds — safety net; writes invalidate eagerly
+# Single-flight: concurrent cache misses wait for one rebuild instead of
+# each running the context query themselves.
+_ctx_lock = asyncio.Lock()
+
+# The whole context body is assembled by Postgres (format + string_agg in C)
+# and returned as one TEXT scalar — one round-trip, no Python row iteration.
+_CONTEXT_SQL = """
+SELECT coalesce(
+           (SELECT string_agg(
+                format('- %s | %s | %s | %s | %s', title, date_start,
+                       coalesce(time, ''), coalesce(place, ''),
+                       coalesce(description, '')),
+                E'\\n' ORDER BY date_start)
+            FROM events WHERE status = 'active'),
+           '')
+       || E'\\n\\n=== Information ===\\n'
+       || coalesce(
+           (SELECT string_agg(
+                format('[%s] %s: %s', category, title, content),
+                E'\\n' ORDER BY category, id)
+            FROM info),
+           '')
+"""
+
+
+def _invalidate_context_cache() -> None:
+    """Drop the cached Claude context; next read rebuilds it lazily.
+
+    Called from every events/info mutation so changes are visible
+    immediately instead of after TTL expiry.
+    """
+    global _ctx_data, _ctx_ts
+    _ctx_data = None
+    _ctx_ts = 0.0
 
 
 async def get_claude_context() -> str:
     """Build a context string from DB data for Claude. Cached for 60s."""
-    now = time.time()
-    if _context_cache["data"] and (now - _context_cache["ts"]) < _CACHE_TTL:
-        return _context_cache["data"]
-
-    events = await get_active_events()
-    infos = await get_all_info()
-
-    parts = ["=== Active events ==="]
-    for e in events:
-        parts.append(
-            f"- {e.title} | {e.date_start} | {e.time or ''} | {e.place or ''} "
-            f"| {e.description or ''}"
-        )
-    parts.append("\n=== Information ===")
-    for i in infos:
-        parts.append(f"[{i['category']}] {i['title']}: {i['content']}")
+    global _ctx_data, _ctx_ts
+    if _ctx_data is not None and (time.monotonic() - _ctx_ts) < _CACHE_TTL:
+        return _ctx_data
 
-    text = "\n".join(parts)
-    _context_cache["data"] = text
-    _context_cache["ts"] = now
-    return text
+    async with _ctx_lock:
+        # Re-check: another waiter may have rebuilt while we queued
+        if _ctx_data is not None and (time.monotonic() - _ctx_ts) < _CACHE_TTL:
+            return _ctx_data
+        body = await pool.fetchval(_CONTEXT_SQL)
+        _ctx_data = "=== Active events ===\n" + body
+        _ctx_ts = time.monotonic()
+        return _ctx_data
 
 
 # ---------------------------------------------------------------------------
 # Super-admin helpers
 # ---------------------------------------------------------------------------
 
+async def ensure_super_admin(username: str) -> bool:
+    """Promote *username* to super_admin unless they already are.
+
+    Single conditional UPDATE — replaces the read-then-write bootstrap
+    pair, saving a round-trip on every start-up.
+    """
+    telegram_id = await pool.fetchval(
+        "UPDATE users SET role = 'super_admin' "
+        "WHERE username = $1 AND role <> 'super_admin' "
+        "RETURNING telegram_id",
+        username,
+    )
+    if telegram_id is None:
+        return False
+    import roles
+
+    roles.invalidate(telegram_id)
+    return True
+
+
 async def get_super_admin_ids() -> list[int]:
     rows = await pool.fetch(
         "SELECT telegram_id FROM users WHERE role = 'super_admin'",
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import hashlib
 import logging
+import re
+import time
+from collections import OrderedDict
 from datetime import date, datetime
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import RetryAfter
 from telegram.ext import (
     Application,
     CallbackQueryHandler,
@@ -38,23 +43,101 @@ WAIT_TEXT_CMD, WAIT_CONFIRM = range(2)
 INFO_CATEGORY, INFO_TITLE, INFO_CONTENT, INFO_CONFIRM = range(20, 24)
 
 
+# Static keyboards — same layout on every call, so build each markup once
+# at import time instead of per message. PTB happily reuses the object.
+_ADMIN_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Создать мероприятие", callback_data="adm:create_event")],
+    [InlineKeyboardButton("Список мероприятий", callback_data="adm:list_events")],
+    [InlineKeyboardButton("Добавить информацию", callback_data="adm:create_info")],
+    [InlineKeyboardButton("Список информации", callback_data="adm:list_info")],
+    [InlineKeyboardButton("Текстовая команда (AI)", callback_data="adm:text_cmd")],
+    [InlineKeyboardButton("Выгрузить в Google Sheets", callback_data="adm:export_sheets")],
+])
+_YES_NO_EVT = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("Да", callback_data="evt_confirm:yes"),
+        InlineKeyboardButton("Нет", callback_data="evt_confirm:no"),
+    ]
+])
+_YES_NO_INFO = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("Да", callback_data="info_confirm:yes"),
+        InlineKeyboardButton("Нет", callback_data="info_confirm:no"),
+    ]
+])
+_YES_NO_AI = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("Да", callback_data="ai_confirm:yes"),
+        InlineKeyboardButton("Нет", callback_data="ai_confirm:no"),
+    ]
+])
+
+
+# Super-admin ids change rarely but are needed on every request-creating
+# admin action — cache them briefly to skip the per-action DB hit.
+_SA_CACHE: dict = {"ids": None, "exp": 0.0}
+_SA_TTL = 60.0  # seconds
+
+
+async def _cached_sa_ids() -> list[int]:
+    if _SA_CACHE["ids"] is not None and time.monotonic() < _SA_CACHE["exp"]:
+        return _SA_CACHE["ids"]
+    ids = await get_super_admin_ids()
+    _SA_CACHE["ids"] = ids
+    _SA_CACHE["exp"] = time.monotonic() + _SA_TTL
+    return ids
+
+
+def _invalidate_sa_cache() -> None:
+    """Drop the cached id list — call when super-admin roles change."""
+    _SA_CACHE["ids"] = None
+    _SA_CACHE["exp"] = 0.0
+
+
+# Bound on simultaneous outgoing sends during fan-out — staying just under
+# Telegram's 30 msg/s global limit avoids a 429 retry storm on big lists.
+_SEND_SEM = asyncio.Semaphore(25)
+
+
+async def _notify_super_admins(bot, sa_ids, text, reply_markup=None) -> None:
+    """Send *text* to every super-admin concurrently.
+
+    One slow or blocked chat no longer delays the rest — sends run in
+    parallel (bounded by _SEND_SEM) and failures are logged per recipient.
+    """
+    async def _one(sa_id):
+        async with _SEND_SEM:
+            try:
+                return await bot.send_message(
+                    sa_id, text, reply_markup=reply_markup
+                )
+            except RetryAfter as e:
+                # Flood control: wait out the penalty once, then retry.
+                await asyncio.sleep(e.retry_after)
+                return await bot.send_message(
+                    sa_id, text, reply_markup=reply_markup
+                )
+
+    results = await asyncio.gather(
+        *[_one(sa_id) for sa_id in sa_ids],
+        return_exceptions=True,
+    )
+    for sa_id, result in zip(sa_ids, results):
+        if isinstance(result, Exception):
+            logger.error(
+                "Failed to notify super_admin %s: %s", sa_id, result,
+            )
+
+
 # ---------------------------------------------------------------------------
 # /admin — main panel
 # ---------------------------------------------------------------------------
 
 @require_role(UserRole.ADMIN, UserRole.SUPER_ADMIN)
 async def cmd_admin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    buttons = [
-        [InlineKeyboardButton("Создать мероприятие", callback_data="adm:create_event")],
-        [InlineKeyboardButton("Список мероприятий", callback_data="adm:list_events")],
-        [InlineKeyboardButton("Добавить информацию", callback_data="adm:create_info")],
-        [InlineKeyboardButton("Список информации", callback_data="adm:list_info")],
-        [InlineKeyboardButton("Текстовая команда (AI)", callback_data="adm:text_cmd")],
-        [InlineKeyboardButton("Выгрузить в Google Sheets", callback_data="adm:export_sheets")],
-    ]
     await update.message.reply_text(
         "Панель администратора:",
-        reply_markup=InlineKeyboardMarkup(buttons),
+        reply_markup=_ADMIN_MARKUP,
     )
 
 
@@ -86,27 +169,24 @@ async def cmd_apply_admin(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     )
 
     # Notify super-admins
-    sa_ids = await get_super_admin_ids()
-    for sa_id in sa_ids:
-        try:
-            await context.bot.send_message(
-                sa_id,
-                f"Новая заявка на админство #{req.id}\n"
-                f"От: {user.full_name} (@{tg.username or '—'})\n"
-                f"Телефон: {user.phone or '—'}",
-                reply_markup=InlineKeyboardMarkup([
-                    [
-                        InlineKeyboardButton(
-                            "Одобрить", callback_data=f"sa:approve:{req.id}"
-                        ),
-                        InlineKeyboardButton(
-                            "Отклонить", callback_data=f"sa:reject:{req.id}"
-                        ),
-                    ]
-                ]),
-            )
-        except Exception:
-            logger.exception("Failed to notify super_admin %s", sa_id)
+    sa_ids = await _cached_sa_ids()
+    await _notify_super_admins(
+        context.bot,
+        sa_ids,
+        f"Новая заявка на админство #{req.id}\n"
+        f"От: {user.full_name} (@{tg.username or '—'})\n"
+        f"Телефон: {user.phone or '—'}",
+        reply_markup=InlineKeyboardMarkup([
+            [
+                InlineKeyboardButton(
+                    "Одобрить", callback_data=f"sa:approve:{req.id}"
+                ),
+                InlineKeyboardButton(
+                    "Отклонить", callback_data=f"sa:reject:{req.id}"
+                ),
+            ]
+        ]),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -117,34 +197,24 @@ async def cmd_apply_admin(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 async def admin_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     query = update.callback_query
     await query.answer()
-    data = query.data
-
-    if data == "adm:list_events":
-        await _list_events(query, context)
-    elif data == "adm:list_info":
-        await _list_info(query, context)
-    elif data == "adm:export_sheets":
-        await _export_sheets(query, context)
-    elif data.startswith("adm:event_detail:"):
-        await _event_detail(query, context)
-    elif data.startswith("adm:event_activate:"):
-        await _event_activate(query, context)
-    elif data.startswith("adm:event_archive:"):
-        await _event_archive(query, context)
-    elif data.startswith("adm:event_regs:"):
-        await _event_registrations(query, context)
-    elif data.startswith("adm:info_delete:"):
-        await _info_delete(query, context)
+
+    # "adm:<action>" or "adm:<action>:<arg>" — one dict lookup, no
+    # startswith chain. Each helper gets the pre-parsed arg.
+    _, _, rest = query.data.partition(":")
+    action, _, arg = rest.partition(":")
+    handler = _ADMIN_ROUTES.get(action)
+    if handler is not None:
+        await handler(query, context, arg)
 
 
 # ---------------------------------------------------------------------------
 # List events
 # ---------------------------------------------------------------------------
 
-async def _list_events(query, context) -> None:
-    events_active = await db.get_events_by_status(EventStatus.ACTIVE)
-    events_pending = await db.get_events_by_status(EventStatus.PENDING)
-    all_events = events_pending + events_active
+async def _list_events(query, context, arg) -> None:
+    all_events = await db.get_events_by_statuses(
+        [EventStatus.PENDING, EventStatus.ACTIVE]
+    )
 
     if not all_events:
         await query.edit_message_text("Нет мероприятий.")
@@ -160,14 +230,14 @@ async def _list_events(query, context) -> None:
     )
 
 
-async def _event_detail(query, context) -> None:
-    event_id = int(query.data.split(":")[-1])
-    event = await db.get_event(event_id)
-    if not event:
+async def _event_detail(query, context, arg) -> None:
+    event_id = int(arg)
+    data = await db.get_event_with_count(event_id)
+    if not data:
         await query.edit_message_text("Мероприятие не найдено.")
         return
 
-    count = await db.count_event_registrations(event_id)
+    event, count = data
     text = (
         f"Мероприятие: {event.title}\n"
         f"Статус: {event.status.value}\n"
@@ -198,8 +268,8 @@ async def _event_detail(query, context) -> None:
     )
 
 
-async def _event_activate(query, context) -> None:
-    event_id = int(query.data.split(":")[-1])
+async def _event_activate(query, context, arg) -> None:
+    event_id = int(arg)
     db_user = context.user_data.get("db_user")
 
     # Only super_admin can directly activate; admins create a request
@@ -227,26 +297,23 @@ async def _event_activate(query, context) -> None:
             f"Заявка #{req.id} на активацию «{event.title}» отправлена супер-админу."
         )
         # Notify super-admins
-        sa_ids = await get_super_admin_ids()
-        for sa_id in sa_ids:
-            try:
-                await context.bot.send_message(
-                    sa_id,
-                    f"Заявка #{req.id}: активация мероприятия «{event.title}»\n"
-                    f"От: @{db_user.username or '—'}",
-                    reply_markup=InlineKeyboardMarkup([
-                        [
-                            InlineKeyboardButton("Одобрить", callback_data=f"sa:approve:{req.id}"),
-                            InlineKeyboardButton("Отклонить", callback_data=f"sa:reject:{req.id}"),
-                        ]
-                    ]),
-                )
-            except Exception:
-                logger.exception("Failed to notify super_admin %s", sa_id)
+        sa_ids = await _cached_sa_ids()
+        await _notify_super_admins(
+            context.bot,
+            sa_ids,
+            f"Заявка #{req.id}: активация мероприятия «{event.title}»\n"
+            f"От: @{db_user.username or '—'}",
+            reply_markup=InlineKeyboardMarkup([
+                [
+                    InlineKeyboardButton("Одобрить", callback_data=f"sa:approve:{req.id}"),
+                    InlineKeyboardButton("Отклонить", callback_data=f"sa:reject:{req.id}"),
+                ]
+            ]),
+        )
 
 
-async def _event_archive(query, context) -> None:
-    event_id = int(query.data.split(":")[-1])
+async def _event_archive(query, context, arg) -> None:
+    event_id = int(arg)
     event = await db.archive_event(event_id)
     if event:
         await query.edit_message_text(f"Мероприятие «{event.title}» архивировано.")
@@ -254,51 +321,85 @@ async def _event_archive(query, context) -> None:
         await query.edit_message_text("Ошибка архивации.")
 
 
-async def _event_registrations(query, context) -> None:
-    event_id = int(query.data.split(":")[-1])
-    regs = await db.get_event_registrations(event_id)
-    event = await db.get_event(event_id)
+# Registrations per page — 50 rows stay well under Telegram's 4096-char
+# message limit, which a single join over a big event would blow past.
+_REGS_PAGE = 50
+
+
+async def _event_registrations(query, context, arg) -> None:
+    # arg is "<event_id>" or "<event_id>:<page>"
+    event_id_str, _, page_str = arg.partition(":")
+    event_id = int(event_id_str)
+    page = int(page_str) if page_str else 0
+
+    # Independent queries — overlap the round-trips
+    regs, event = await asyncio.gather(
+        db.get_event_registrations(event_id),
+        db.get_event(event_id),
+    )
     if not regs:
         await query.edit_message_text(
             f"На «{event.title if event else event_id}» пока нет записей."
         )
         return
 
-    lines = [f"Записи на «{event.title}» ({len(regs)}):\n"]
-    for i, r in enumerate(regs, 1):
-        lines.append(
-            f"{i}. {r.full_name} | @{r.username or '—'} | "
-            f"тел: {r.phone or '—'} | ур: {r.level or '—'}"
-        )
-    await query.edit_message_text("\n".join(lines))
+    pages = (len(regs) + _REGS_PAGE - 1) // _REGS_PAGE
+    page = max(0, min(page, pages - 1))
+    start = page * _REGS_PAGE
+    body = "\n".join(
+        f"{i}. {r.full_name} | @{r.username or '—'} | "
+        f"тел: {r.phone or '—'} | ур: {r.level or '—'}"
+        for i, r in enumerate(regs[start:start + _REGS_PAGE], start + 1)
+    )
+
+    header = f"Записи на «{event.title}» ({len(regs)})"
+    if pages > 1:
+        header += f", стр. {page + 1}/{pages}"
+
+    nav = []
+    if page > 0:
+        nav.append(InlineKeyboardButton(
+            "◀", callback_data=f"adm:event_regs:{event_id}:{page - 1}"
+        ))
+    if page < pages - 1:
+        nav.append(InlineKeyboardButton(
+            "▶", callback_data=f"adm:event_regs:{event_id}:{page + 1}"
+        ))
+
+    await query.edit_message_text(
+        f"{header}:\n\n{body}",
+        reply_markup=InlineKeyboardMarkup([nav]) if nav else None,
+    )
 
 
 # ---------------------------------------------------------------------------
 # List info
 # ---------------------------------------------------------------------------
 
-async def _list_info(query, context) -> None:
+async def _list_info(query, context, arg) -> None:
     infos = await db.get_all_info()
     if not infos:
         await query.edit_message_text("Информация не добавлена.")
         return
 
-    lines = ["Информация:\n"]
-    buttons = []
-    for i in infos:
-        lines.append(f"[{i['category']}] {i['title']}: {i['content'][:80]}")
-        buttons.append([InlineKeyboardButton(
+    body = "\n".join(
+        f"[{i['category']}] {i['title']}: {i['content'][:80]}" for i in infos
+    )
+    buttons = [
+        [InlineKeyboardButton(
             f"Удалить: {i['title'][:30]}", callback_data=f"adm:info_delete:{i['id']}"
-        )])
+        )]
+        for i in infos
+    ]
 
     await query.edit_message_text(
-        "\n".join(lines),
+        f"Информация:\n\n{body}",
         reply_markup=InlineKeyboardMarkup(buttons) if buttons else None,
     )
 
 
-async def _info_delete(query, context) -> None:
-    info_id = int(query.data.split(":")[-1])
+async def _info_delete(query, context, arg) -> None:
+    info_id = int(arg)
     ok = await db.delete_info(info_id)
     if ok:
         await query.edit_message_text("Информация удалена.")
@@ -310,14 +411,53 @@ async def _info_delete(query, context) -> None:
 # Export to Google Sheets
 # ---------------------------------------------------------------------------
 
-async def _export_sheets(query, context) -> None:
-    await query.edit_message_text("Экспорт в Google Sheets...")
+async def _export_sheets(query, context, arg) -> None:
+    # The export can take a long while — run it in the background so the
+    # handler (and the update queue behind it) is not held up, and edit
+    # the progress message when the task finishes.
+    await query.edit_message_text("Экспорт в Google Sheets запущен в фоне...")
+    chat_id = query.message.chat_id
+    msg_id = query.message.message_id
+    # application.create_task keeps a strong reference (a bare
+    # asyncio.create_task can be garbage-collected mid-flight) and routes
+    # failures to the PTB error handlers.
+    context.application.create_task(_do_export(context.bot, chat_id, msg_id))
+
+
+async def _do_export(bot, chat_id: int, msg_id: int) -> None:
     try:
         result = await sheets_sync.export_all()
-        await query.edit_message_text(result)
+        await bot.edit_message_text(result, chat_id=chat_id, message_id=msg_id)
     except Exception:
         logger.exception("Sheets export error")
-        await query.edit_message_text("Ошибка экспорта. Проверьте настройки.")
+        await bot.edit_message_text(
+            "Ошибка экспорта. Проверьте настройки.",
+            chat_id=chat_id,
+            message_id=msg_id,
+        )
+
+
+# Prefix -> helper dispatch for admin_callback. All helpers share the
+# (query, context, arg) signature; arg is "" for argument-less actions.
+_ADMIN_ROUTES = {
+    "list_events": _list_events,
+    "list_info": _list_info,
+    "export_sheets": _export_sheets,
+    "event_detail": _event_detail,
+    "event_activate": _event_activate,
+    "event_archive": _event_archive,
+    "event_regs": _event_registrations,
+    "info_delete": _info_delete,
+}
+
+# Precompiled and factored dispatch pattern — PTB matches it against every
+# callback query, so don't make it recompile or walk 8 flat alternatives.
+_ADMIN_CB_RE = re.compile(
+    r"^adm:(?:list_events|list_info|export_sheets"
+    r"|event_(?:detail|activate|archive):\d+"
+    r"|event_regs:\d+(?::\d+)?"
+    r"|info_delete:\d+)$"
+)
 
 
 # ---------------------------------------------------------------------------
@@ -333,70 +473,75 @@ async def evt_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 
 async def evt_title(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["evt_title"] = update.message.text.strip()
-    await update.message.reply_text("Введите дату начала (ГГГГ-ММ-ДД):")
+    msg = update.message
+    # All collected fields live under one user_data key — one lookup per
+    # handler and a single entry for the persistence layer to track.
+    context.user_data["evt"] = {"title": msg.text.strip()}
+    await msg.reply_text("Введите дату начала (ГГГГ-ММ-ДД):")
     return EVT_DATE
 
 
 async def evt_date(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    text = update.message.text.strip()
+    msg = update.message
+    text = msg.text.strip()
     try:
-        context.user_data["evt_date"] = date.fromisoformat(text)
+        context.user_data["evt"]["date_start"] = date.fromisoformat(text)
     except ValueError:
-        await update.message.reply_text("Неверный формат даты. Используйте ГГГГ-ММ-ДД:")
+        await msg.reply_text("Неверный формат даты. Используйте ГГГГ-ММ-ДД:")
         return EVT_DATE
-    await update.message.reply_text("Введите время (или /skip):")
+    await msg.reply_text("Введите время (или /skip):")
     return EVT_TIME
 
 
 async def evt_time(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    text = update.message.text.strip()
-    context.user_data["evt_time"] = text if text != "/skip" else None
-    await update.message.reply_text("Введите место (или /skip):")
+    msg = update.message
+    raw = msg.text
+    # Skip the strip() allocation entirely on the common /skip path
+    context.user_data["evt"]["time"] = None if raw[:5] == "/skip" else raw.strip()
+    await msg.reply_text("Введите место (или /skip):")
     return EVT_PLACE
 
 
 async def evt_place(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    text = update.message.text.strip()
-    context.user_data["evt_place"] = text if text != "/skip" else None
-    await update.message.reply_text("Введите описание (или /skip):")
+    msg = update.message
+    raw = msg.text
+    context.user_data["evt"]["place"] = None if raw[:5] == "/skip" else raw.strip()
+    await msg.reply_text("Введите описание (или /skip):")
     return EVT_DESC
 
 
 async def evt_desc(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    text = update.message.text.strip()
-    context.user_data["evt_desc"] = text if text != "/skip" else None
-    await update.message.reply_text(
+    msg = update.message
+    raw = msg.text
+    context.user_data["evt"]["description"] = None if raw[:5] == "/skip" else raw.strip()
+    await msg.reply_text(
         "Введите макс. количество участников (0 = без ограничений, или /skip):"
     )
     return EVT_MAX
 
 
 async def evt_max(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    text = update.message.text.strip()
-    if text == "/skip":
-        context.user_data["evt_max"] = 0
+    msg = update.message
+    raw = msg.text
+    evt = context.user_data["evt"]
+    if raw[:5] == "/skip":
+        evt["max_participants"] = 0
     else:
         try:
-            context.user_data["evt_max"] = int(text)
+            evt["max_participants"] = int(raw.strip())
         except ValueError:
-            context.user_data["evt_max"] = 0
+            evt["max_participants"] = 0
 
-    title = context.user_data["evt_title"]
-    d = context.user_data["evt_date"]
-    t = context.user_data.get("evt_time") or "—"
-    p = context.user_data.get("evt_place") or "—"
+    title = evt["title"]
+    d = evt["date_start"]
+    t = evt.get("time") or "—"
+    p = evt.get("place") or "—"
 
-    await update.message.reply_text(
+    await msg.reply_text(
         f"Подтвердите создание:\n\n"
         f"Название: {title}\nДата: {d}\nВремя: {t}\nМесто: {p}\n\n"
         "Создать? (да/нет)",
-        reply_markup=InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("Да", callback_data="evt_confirm:yes"),
-                InlineKeyboardButton("Нет", callback_data="evt_confirm:no"),
-            ]
-        ]),
+        reply_markup=_YES_NO_EVT,
     )
     return EVT_CONFIRM
 
@@ -412,13 +557,9 @@ async def evt_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     db_user = context.user_data.get("db_user")
     username = db_user.username if db_user else None
 
+    evt = context.user_data.pop("evt")
     event = await db.create_event(
-        title=context.user_data["evt_title"],
-        date_start=context.user_data["evt_date"],
-        time=context.user_data.get("evt_time"),
-        place=context.user_data.get("evt_place"),
-        description=context.user_data.get("evt_desc"),
-        max_participants=context.user_data.get("evt_max", 0),
+        **evt,
         status=EventStatus.PENDING,
         created_by=username,
     )
@@ -439,22 +580,19 @@ async def evt_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
             payload_json={"event_id": event.id, "event_title": event.title},
             comment=f"Новое мероприятие «{event.title}»",
         )
-        sa_ids = await get_super_admin_ids()
-        for sa_id in sa_ids:
-            try:
-                await context.bot.send_message(
-                    sa_id,
-                    f"Заявка #{req.id}: новое мероприятие «{event.title}»\n"
-                    f"Дата: {event.date_start}\nОт: @{username or '—'}",
-                    reply_markup=InlineKeyboardMarkup([
-                        [
-                            InlineKeyboardButton("Одобрить", callback_data=f"sa:approve:{req.id}"),
-                            InlineKeyboardButton("Отклонить", callback_data=f"sa:reject:{req.id}"),
-                        ]
-                    ]),
-                )
-            except Exception:
-                logger.exception("Failed to notify super_admin %s", sa_id)
+        sa_ids = await _cached_sa_ids()
+        await _notify_super_admins(
+            context.bot,
+            sa_ids,
+            f"Заявка #{req.id}: новое мероприятие «{event.title}»\n"
+            f"Дата: {event.date_start}\nОт: @{username or '—'}",
+            reply_markup=InlineKeyboardMarkup([
+                [
+                    InlineKeyboardButton("Одобрить", callback_data=f"sa:approve:{req.id}"),
+                    InlineKeyboardButton("Отклонить", callback_data=f"sa:reject:{req.id}"),
+                ]
+            ]),
+        )
 
         await query.edit_message_text(
             f"Мероприятие «{event.title}» создано (#{event.id}). "
@@ -484,33 +622,32 @@ async def info_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 
 async def info_category(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["info_cat"] = update.message.text.strip()
-    await update.message.reply_text("Введите заголовок:")
+    msg = update.message
+    context.user_data["info"] = {"category": msg.text.strip()}
+    await msg.reply_text("Введите заголовок:")
     return INFO_TITLE
 
 
 async def info_title(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["info_title"] = update.message.text.strip()
-    await update.message.reply_text("Введите содержание:")
+    msg = update.message
+    context.user_data["info"]["title"] = msg.text.strip()
+    await msg.reply_text("Введите содержание:")
     return INFO_CONTENT
 
 
 async def info_content(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["info_content"] = update.message.text.strip()
+    msg = update.message
+    info = context.user_data["info"]
+    info["content"] = msg.text.strip()
 
-    cat = context.user_data["info_cat"]
-    title = context.user_data["info_title"]
-    content = context.user_data["info_content"]
+    cat = info["category"]
+    title = info["title"]
+    content = info["content"]
 
-    await update.message.reply_text(
+    await msg.reply_text(
         f"Категория: {cat}\nЗаголовок: {title}\nСодержание: {content}\n\n"
         "Сохранить?",
-        reply_markup=InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("Да", callback_data="info_confirm:yes"),
-                InlineKeyboardButton("Нет", callback_data="info_confirm:no"),
-            ]
-        ]),
+        reply_markup=_YES_NO_INFO,
     )
     return INFO_CONFIRM
 
@@ -523,11 +660,7 @@ async def info_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
         await query.edit_message_text("Отменено.")
         return ConversationHandler.END
 
-    info_id = await db.create_info(
-        category=context.user_data["info_cat"],
-        title=context.user_data["info_title"],
-        content=context.user_data["info_content"],
-    )
+    info_id = await db.create_info(**context.user_data.pop("info"))
     await query.edit_message_text(f"Информация #{info_id} сохранена.")
     return ConversationHandler.END
 
@@ -541,6 +674,41 @@ async def info_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
 # AI text command (ConversationHandler)
 # ---------------------------------------------------------------------------
 
+# Parsed-command cache: admins often retry the same phrasing, and a repeat
+# should not pay Claude latency (or cost) again. Keyed per admin on the
+# whitespace/case-normalized text plus the admin's table set (tables are
+# part of the prompt, so a grant must miss), bounded FIFO. The TTL keeps
+# relative phrasings like «завтра» from replaying a date Claude resolved
+# days earlier.
+_AI_CACHE: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_AI_CACHE_MAX = 256
+_AI_TTL = 3600.0  # seconds
+
+
+def _norm(s: str) -> str:
+    return " ".join(s.lower().split())
+
+
+# Table assignments change only through super-admin approval, so a long
+# per-username TTL is safe — the approval flow invalidates explicitly.
+_TABLES_CACHE: dict[str, tuple[float, list[str]]] = {}
+_TABLES_TTL = 300.0  # seconds
+
+
+async def _cached_admin_tables(username: str) -> list[str]:
+    entry = _TABLES_CACHE.get(username)
+    if entry is not None and time.monotonic() - entry[0] < _TABLES_TTL:
+        return entry[1]
+    tables = await db.get_admin_tables(username)
+    _TABLES_CACHE[username] = (time.monotonic(), tables)
+    return tables
+
+
+def _invalidate_tables_cache(username: str) -> None:
+    """Drop a user's cached table list — call when assignments change."""
+    _TABLES_CACHE.pop(username, None)
+
+
 @require_role(UserRole.ADMIN, UserRole.SUPER_ADMIN)
 async def text_cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
@@ -556,20 +724,27 @@ async def text_cmd_parse(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     text = update.message.text.strip()
     db_user = context.user_data.get("db_user")
     username = db_user.username if db_user else ""
-    tables = await db.get_admin_tables(username) if username else []
-
-    result = await parse_admin_command(text, username, tables)
+    tables = await _cached_admin_tables(username) if username else []
+
+    key = hashlib.blake2b(
+        f"{username}|{','.join(tables)}|{_norm(text)}".encode(), digest_size=16,
+    ).hexdigest()
+    entry = _AI_CACHE.get(key)
+    if entry is not None and time.monotonic() - entry[0] < _AI_TTL:
+        result = entry[1]
+        _AI_CACHE.move_to_end(key)
+    else:
+        result = await parse_admin_command(text, username, tables)
+        if result.get("action") != "unknown":
+            _AI_CACHE[key] = (time.monotonic(), result)
+            while len(_AI_CACHE) > _AI_CACHE_MAX:
+                _AI_CACHE.popitem(last=False)
     context.user_data["ai_cmd_result"] = result
 
     await update.message.reply_text(
         f"Распознано: {result.get('confirmation', '—')}\n\n"
         "Выполнить?",
-        reply_markup=InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("Да", callback_data="ai_confirm:yes"),
-                InlineKeyboardButton("Нет", callback_data="ai_confirm:no"),
-            ]
-        ]),
+        reply_markup=_YES_NO_AI,
     )
     return WAIT_CONFIRM
 
@@ -639,19 +814,24 @@ async def text_cmd_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 # ---------------------------------------------------------------------------
 
 def register(app: Application) -> None:
+    # Conversations persist (and survive worker handoff) only when the app
+    # was built with a persistence backend — see bot.main / REDIS_URL.
+    persistent = app.persistence is not None
+
     app.add_handler(CommandHandler("admin", cmd_admin))
     app.add_handler(CommandHandler("apply_admin", cmd_apply_admin))
 
     # Admin panel button callbacks (non-conversation)
     app.add_handler(CallbackQueryHandler(
         admin_callback,
-        pattern=r"^adm:(list_events|list_info|export_sheets|event_detail:\d+|event_activate:\d+|event_archive:\d+|event_regs:\d+|info_delete:\d+)$",
+        pattern=_ADMIN_CB_RE,
+        block=False,
     ))
 
     # Event creation conversation
     evt_conv = ConversationHandler(
         entry_points=[
-            CallbackQueryHandler(evt_start, pattern=r"^adm:create_event$"),
+            CallbackQueryHandler(evt_start, pattern=r"^adm:create_event$", block=False),
         ],
         states={
             EVT_TITLE: [MessageHandler(filters.TEXT & ~filters.COMMAND, evt_title)],
@@ -673,19 +853,23 @@ def register(app: Application) -> None:
                 CommandHandler("skip", evt_max),
             ],
             EVT_CONFIRM: [
-                CallbackQueryHandler(evt_confirm, pattern=r"^evt_confirm:(yes|no)$"),
+                CallbackQueryHandler(
+                    evt_confirm, pattern=r"^evt_confirm:(yes|no)$", block=False,
+                ),
             ],
         },
         fallbacks=[CommandHandler("cancel", evt_cancel)],
         per_user=True,
         per_chat=True,
+        name="admin_evt",
+        persistent=persistent,
     )
     app.add_handler(evt_conv)
 
     # Info creation conversation
     info_conv = ConversationHandler(
         entry_points=[
-            CallbackQueryHandler(info_start, pattern=r"^adm:create_info$"),
+            CallbackQueryHandler(info_start, pattern=r"^adm:create_info$", block=False),
         ],
         states={
             INFO_CATEGORY: [MessageHandler(filters.TEXT & ~filters.COMMAND, info_category)],
@@ -698,16 +882,23 @@ def register(app: Application) -> None:
         fallbacks=[CommandHandler("cancel", info_cancel)],
         per_user=True,
         per_chat=True,
+        name="admin_info",
+        persistent=persistent,
     )
     app.add_handler(info_conv)
 
     # AI text command conversation
     ai_conv = ConversationHandler(
         entry_points=[
-            CallbackQueryHandler(text_cmd_start, pattern=r"^adm:text_cmd$"),
+            CallbackQueryHandler(text_cmd_start, pattern=r"^adm:text_cmd$", block=False),
         ],
         states={
-            WAIT_TEXT_CMD: [MessageHandler(filters.TEXT & ~filters.COMMAND, text_cmd_parse)],
+            # Awaits Claude — must not block other updates
+            WAIT_TEXT_CMD: [
+                MessageHandler(
+                    filters.TEXT & ~filters.COMMAND, text_cmd_parse, block=False,
+                ),
+            ],
             WAIT_CONFIRM: [
                 CallbackQueryHandler(text_cmd_confirm, pattern=r"^ai_confirm:(yes|no)$"),
             ],
@@ -715,5 +906,7 @@ def register(app: Application) -> None:
         fallbacks=[CommandHandler("cancel", text_cmd_cancel)],
         per_user=True,
         per_chat=True,
+        name="admin_ai",
+        persistent=persistent,
     )
     app.add_handler(ai_conv)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import re
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
@@ -22,6 +23,11 @@ logger = logging.getLogger(__name__)
 # Conversation states
 ASK_NAME, ASK_PHONE, ASK_LEVEL, CONFIRM = range(4)
 
+# Callback patterns, compiled once at import — PTB matches these against
+# every callback query that reaches the conversation.
+_REG_START_RE = re.compile(r"^reg_start:(\d+)$")
+_REG_CONFIRM_RE = re.compile(r"^reg_confirm:(yes|no)$")
+
 
 # ---------------------------------------------------------------------------
 # Entry point: button click "reg_start:<event_id>"
@@ -31,7 +37,8 @@ async def reg_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
     await query.answer()
 
-    event_id = int(query.data.split(":")[1])
+    # Reuse the routing match — PTB already ran _REG_START_RE on the data
+    event_id = int(context.matches[0].group(1))
     event = await db.get_event(event_id)
 
     if not event:
@@ -48,9 +55,12 @@ async def reg_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
     context.user_data["reg_event_id"] = event_id
     context.user_data["reg_event_title"] = event.title
+    # Keep the whole event — confirm re-checks capacity without a SELECT
+    context.user_data["reg_event"] = event
 
-    # Pre-fill name from DB
+    # Pre-fill name and phone from DB
     user = await db.get_user(update.effective_user.id)
+    context.user_data["prefill_phone"] = user.phone if user else None
     if user and user.full_name:
         context.user_data["reg_name"] = user.full_name
         await query.edit_message_text(
@@ -72,9 +82,15 @@ async def ask_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     if text and text != "/skip":
         context.user_data["reg_name"] = text
 
-    await update.message.reply_text(
-        "Введите номер телефона (или /skip чтобы пропустить):"
-    )
+    prefill = context.user_data.get("prefill_phone")
+    if prefill:
+        await update.message.reply_text(
+            f"Введите номер телефона (или /skip чтобы оставить {prefill}):"
+        )
+    else:
+        await update.message.reply_text(
+            "Введите номер телефона (или /skip чтобы пропустить):"
+        )
     return ASK_PHONE
 
 
@@ -83,7 +99,7 @@ async def ask_phone(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     if text and text != "/skip":
         context.user_data["reg_phone"] = text
     else:
-        context.user_data["reg_phone"] = None
+        context.user_data["reg_phone"] = context.user_data.get("prefill_phone")
 
     await update.message.reply_text(
         "Укажите ваш уровень/опыт (или /skip чтобы пропустить):"
@@ -124,7 +140,7 @@ async def confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
     await query.answer()
 
-    if query.data == "reg_confirm:no":
+    if context.matches[0].group(1) == "no":
         await query.edit_message_text("Запись отменена.")
         return ConversationHandler.END
 
@@ -134,6 +150,18 @@ async def confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     phone = context.user_data.get("reg_phone")
     level = context.user_data.get("reg_level")
 
+    # Final capacity check against the event stashed at reg_start — the
+    # counter is in-process, so this costs nothing and catches slots that
+    # filled up while the user was typing.
+    event = context.user_data.get("reg_event")
+    if event and event.max_participants > 0:
+        count = await db.count_event_registrations(event_id)
+        if count >= event.max_participants:
+            await query.edit_message_text(
+                f"К сожалению, мест на «{event.title}» больше нет."
+            )
+            return ConversationHandler.END
+
     try:
         await db.register_for_event(
             event_id=event_id,
@@ -165,7 +193,7 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 def register(app: Application) -> None:
     conv = ConversationHandler(
         entry_points=[
-            CallbackQueryHandler(reg_start, pattern=r"^reg_start:\d+$"),
+            CallbackQueryHandler(reg_start, pattern=_REG_START_RE),
         ],
         states={
             ASK_NAME: [
@@ -181,7 +209,7 @@ def register(app: Application) -> None:
                 CommandHandler("skip", ask_level),
             ],
             CONFIRM: [
-                CallbackQueryHandler(confirm, pattern=r"^reg_confirm:(yes|no)$"),
+                CallbackQueryHandler(confirm, pattern=_REG_CONFIRM_RE),
             ],
         },
         fallbacks=[CommandHandler("cancel", cancel)],
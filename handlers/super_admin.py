@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
+
+from aiolimiter import AsyncLimiter
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest, Forbidden
 from telegram.ext import (
     Application,
     CallbackQueryHandler,
@@ -18,12 +23,39 @@ from telegram.ext import (
 import db
 from models import UserRole
 from roles import require_role
+from handlers.admin import _invalidate_sa_cache, _invalidate_tables_cache
 
 logger = logging.getLogger(__name__)
 
 # Broadcast conversation states
 BC_TEXT, BC_CONFIRM = range(50, 52)
 
+# Callback patterns, compiled once at import
+_SA_DECISION_RE = re.compile(r"^sa:(approve|reject):(\d+)$")
+_BC_CONFIRM_RE = re.compile(r"^bc_confirm:(yes|no)$")
+
+# Telegram allows ~30 messages/second bot-wide; shape broadcast fan-out to
+# that window instead of sending one-at-a-time (N sequential round-trips).
+_BROADCAST_LIMITER = AsyncLimiter(30, 1)
+
+
+async def _broadcast(bot, ids, message: str) -> int:
+    """Send *message* to every id concurrently, rate-shaped. Returns sent count."""
+    async def _send(tid: int) -> int:
+        async with _BROADCAST_LIMITER:
+            try:
+                await bot.send_message(tid, message)
+                return 1
+            except (Forbidden, BadRequest):
+                # Blocked the bot / deleted account — skip quietly
+                return 0
+            except Exception:
+                logger.exception("Broadcast send failed for %s", tid)
+                return 0
+
+    results = await asyncio.gather(*[_send(t) for t in ids])
+    return sum(results)
+
 
 # ---------------------------------------------------------------------------
 # Approve / Reject callbacks
@@ -36,10 +68,11 @@ async def handle_request_decision(
     query = update.callback_query
     await query.answer()
 
-    parts = query.data.split(":")
-    # "sa:approve:123" or "sa:reject:123"
-    action = parts[1]
-    request_id = int(parts[2])
+    # PTB matched query.data against _SA_DECISION_RE to route here —
+    # reuse its groups instead of re-splitting the payload.
+    match = context.matches[0]
+    action = match.group(1)
+    request_id = int(match.group(2))
 
     db_user = context.user_data.get("db_user")
     reviewer = db_user.username if db_user else "super_admin"
@@ -59,11 +92,33 @@ async def handle_request_decision(
     if action == "approve":
         await _apply_approval(req, context)
 
-    await query.edit_message_text(
+    decided = (
         f"Заявка #{request_id} ({req.request_type}) {status_text}.\n"
         f"Заявитель: @{req.username}"
     )
 
+    # /pending groups several requests into one message — drop only the
+    # decided block and its button row so the other requests stay
+    # actionable, and report the outcome in a separate reply.
+    message = query.message
+    markup = message.reply_markup
+    rows = [
+        row for row in (markup.inline_keyboard if markup else [])
+        if row[0].callback_data != f"sa:approve:{request_id}"
+    ]
+    blocks = [
+        b for b in (message.text or "").split("\n\n")
+        if not b.startswith(f"Заявка #{request_id}\n")
+    ]
+    if rows and blocks:
+        await query.edit_message_text(
+            "\n\n".join(blocks),
+            reply_markup=InlineKeyboardMarkup(rows),
+        )
+        await message.reply_text(decided)
+    else:
+        await query.edit_message_text(decided)
+
     # Notify the requester
     if req.telegram_id:
         try:
@@ -78,11 +133,11 @@ async def handle_request_decision(
 async def _apply_approval(req, context) -> None:
     """Execute side-effects when a request is approved."""
     if req.request_type == "admin_access":
-        # Grant admin role
-        await db.set_user_role(req.username, UserRole.ADMIN)
-        # Grant access to requested table (if any)
+        # Role + table grant in one transaction — no half-applied approvals
+        await db.grant_admin(req.username, req.requested_table)
         if req.requested_table:
-            await db.grant_table_access(req.username, req.requested_table)
+            _invalidate_tables_cache(req.username)
+        _invalidate_sa_cache()
         logger.info("Granted admin role to @%s", req.username)
 
     elif req.request_type in ("event_creation", "event_activation"):
@@ -100,14 +155,15 @@ async def _apply_approval(req, context) -> None:
         scope = payload.get("scope", "all")
         if message:
             ids = await db.get_all_telegram_ids()
-            sent = 0
-            for tid in ids:
-                try:
-                    await context.bot.send_message(tid, message)
-                    sent += 1
-                except Exception:
-                    pass
-            logger.info("Broadcast sent to %d/%d users", sent, len(ids))
+
+            async def _run() -> None:
+                sent = await _broadcast(context.bot, ids, message)
+                logger.info("Broadcast sent to %d/%d users", sent, len(ids))
+
+            # Fire-and-forget — the approve callback answers immediately
+            # instead of waiting out the whole fan-out. PTB's create_task
+            # keeps a strong reference so the broadcast can't be GC'd.
+            context.application.create_task(_run())
 
 
 # ---------------------------------------------------------------------------
@@ -121,6 +177,12 @@ async def cmd_pending(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         await update.message.reply_text("Нет ожидающих заявок.")
         return
 
+    # Group up to 10 requests per message (flushing early near Telegram's
+    # 4096-char limit) instead of one Bot API round-trip per request; each
+    # grouped message carries a button row per request.
+    blocks: list[str] = []
+    buttons: list[list[InlineKeyboardButton]] = []
+    length = 0
     for req in reqs:
         text = (
             f"Заявка #{req.id}\n"
@@ -130,14 +192,23 @@ async def cmd_pending(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             f"Комментарий: {req.comment or '—'}\n"
             f"Дата: {req.created_at}"
         )
+        if blocks and (len(blocks) >= 10 or length + len(text) + 2 > 4000):
+            await update.message.reply_text(
+                "\n\n".join(blocks),
+                reply_markup=InlineKeyboardMarkup(buttons),
+            )
+            blocks, buttons, length = [], [], 0
+        blocks.append(text)
+        length += len(text) + 2
+        buttons.append([
+            InlineKeyboardButton(f"Одобрить #{req.id}", callback_data=f"sa:approve:{req.id}"),
+            InlineKeyboardButton(f"Отклонить #{req.id}", callback_data=f"sa:reject:{req.id}"),
+        ])
+
+    if blocks:
         await update.message.reply_text(
-            text,
-            reply_markup=InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton("Одобрить", callback_data=f"sa:approve:{req.id}"),
-                    InlineKeyboardButton("Отклонить", callback_data=f"sa:reject:{req.id}"),
-                ]
-            ]),
+            "\n\n".join(blocks),
+            reply_markup=InlineKeyboardMarkup(buttons),
         )
 
 
@@ -174,19 +245,13 @@ async def broadcast_confirm(
     query = update.callback_query
     await query.answer()
 
-    if query.data == "bc_confirm:no":
+    if context.matches[0].group(1) == "no":
         await query.edit_message_text("Рассылка отменена.")
         return ConversationHandler.END
 
     message = context.user_data.get("bc_text", "")
     ids = await db.get_all_telegram_ids()
-    sent = 0
-    for tid in ids:
-        try:
-            await context.bot.send_message(tid, message)
-            sent += 1
-        except Exception:
-            pass
+    sent = await _broadcast(context.bot, ids, message)
 
     await query.edit_message_text(f"Рассылка отправлена {sent}/{len(ids)} пользователям.")
     return ConversationHandler.END
@@ -224,6 +289,7 @@ async def cmd_set_role(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
     ok = await db.set_user_role(username, role)
     if ok:
+        _invalidate_sa_cache()
         await update.message.reply_text(
             f"Роль @{username} изменена на {role.value}."
         )
@@ -238,7 +304,7 @@ async def cmd_set_role(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 def register(app: Application) -> None:
     app.add_handler(CallbackQueryHandler(
         handle_request_decision,
-        pattern=r"^sa:(approve|reject):\d+$",
+        pattern=_SA_DECISION_RE,
     ))
     app.add_handler(CommandHandler("pending", cmd_pending))
     app.add_handler(CommandHandler("set_role", cmd_set_role))
@@ -248,7 +314,7 @@ def register(app: Application) -> None:
         states={
             BC_TEXT: [MessageHandler(filters.TEXT & ~filters.COMMAND, broadcast_text)],
             BC_CONFIRM: [
-                CallbackQueryHandler(broadcast_confirm, pattern=r"^bc_confirm:(yes|no)$"),
+                CallbackQueryHandler(broadcast_confirm, pattern=_BC_CONFIRM_RE),
             ],
         },
         fallbacks=[CommandHandler("cancel", broadcast_cancel)],
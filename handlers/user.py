@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
+import time
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
@@ -15,10 +18,24 @@ from telegram.ext import (
 )
 
 import db
-from claude_ai import answer_user_question
+from claude_ai import stream_user_answer
 
 logger = logging.getLogger(__name__)
 
+# Minimum interval between streaming message edits — Telegram rate-limits
+# edits per chat, so partial text is flushed at most this often.
+_EDIT_INTERVAL = 0.6
+
+# Matches the whole line carrying Claude's registration marker — one scan
+# over the reply instead of a per-line split loop.
+_MARKER_RE = re.compile(r"(?m)^.*ЗАПИСЬ_ТРЕБУЕТСЯ[:\s]*(.*)$")
+
+# In-flight dedupe: a user re-sending the same question while its answer
+# is still streaming awaits the first call's result instead of paying for
+# a second generation. Keyed on (user, normalized text) so a genuinely
+# new question always gets its own call.
+_INFLIGHT: dict[tuple[int, str], asyncio.Future] = {}
+
 
 # ---------------------------------------------------------------------------
 # /start
@@ -34,6 +51,8 @@ async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         username=username,
         full_name=full_name,
     )
+    # Keep the fresh record for handle_message — saves it a SELECT
+    context.user_data["db_user"] = user
 
     await update.message.reply_text(
         f"Добро пожаловать, {user.full_name}!\n\n"
@@ -68,12 +87,25 @@ async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 # /events
 # ---------------------------------------------------------------------------
 
+# Rendered /events reply, keyed by a fingerprint of everything displayed.
+# The event list changes rarely but /events is called constantly — reuse
+# the same text/markup while the underlying rows are identical.
+_EVENTS_CACHE: tuple[tuple, str, InlineKeyboardMarkup] | None = None
+
+
 async def cmd_events(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    global _EVENTS_CACHE
     events = await db.get_active_events()
     if not events:
         await update.message.reply_text("Сейчас нет активных мероприятий.")
         return
 
+    sig = tuple((e.id, e.title, e.date_start, e.time, e.place) for e in events)
+    if _EVENTS_CACHE is not None and _EVENTS_CACHE[0] == sig:
+        _, text, markup = _EVENTS_CACHE
+        await update.message.reply_text(text, reply_markup=markup)
+        return
+
     lines = ["Активные мероприятия:\n"]
     buttons = []
     for e in events:
@@ -91,8 +123,10 @@ async def cmd_events(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
             )
         ])
 
-    markup = InlineKeyboardMarkup(buttons) if buttons else None
-    await update.message.reply_text("\n".join(lines), reply_markup=markup)
+    text = "\n".join(lines)
+    markup = InlineKeyboardMarkup(buttons)
+    _EVENTS_CACHE = (sig, text, markup)
+    await update.message.reply_text(text, reply_markup=markup)
 
 
 # ---------------------------------------------------------------------------
@@ -124,23 +158,60 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if not text:
         return
 
-    # Ensure user exists
-    user = await db.get_user(tg.id)
+    # Ensure user exists — /start or any role-checked handler has usually
+    # stashed the record already, making this path zero-query.
+    user = context.user_data.get("db_user")
     if not user:
-        user = await db.upsert_user(tg.id, tg.username, tg.full_name or "")
+        user = await db.get_user(tg.id)
+        if not user:
+            user = await db.upsert_user(tg.id, tg.username, tg.full_name or "")
+        context.user_data["db_user"] = user
+
+    # Immediate feedback while Claude spins up — fire-and-forget via the
+    # application so the task is strongly referenced until done
+    context.application.create_task(
+        context.bot.send_chat_action(update.effective_chat.id, "typing")
+    )
 
-    reply = await answer_user_question(text, user.full_name)
+    # Stream the answer into one message, editing as chunks arrive —
+    # the user sees the first words in ~hundreds of ms instead of
+    # waiting for the full generation.
+    placeholder = await update.message.reply_text("…")
+    shown = "…"
+
+    flight_key = (tg.id, " ".join(text.lower().split()))
+    inflight = _INFLIGHT.get(flight_key)
+    if inflight is not None:
+        reply = await inflight
+    else:
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        _INFLIGHT[flight_key] = fut
+        buf: list[str] = []
+        try:
+            last_edit = time.monotonic()
+            async for chunk in stream_user_answer(text):
+                buf.append(chunk)
+                now = time.monotonic()
+                if now - last_edit >= _EDIT_INTERVAL:
+                    partial = "".join(buf).strip()
+                    if partial and partial != shown:
+                        try:
+                            await placeholder.edit_text(partial)
+                            shown = partial
+                        except Exception:
+                            logger.debug("Stream edit failed", exc_info=True)
+                    last_edit = now
+        finally:
+            _INFLIGHT.pop(flight_key, None)
+            fut.set_result("".join(buf))
+        reply = fut.result()
 
     # Check if Claude wants to trigger registration
-    if "ЗАПИСЬ_ТРЕБУЕТСЯ" in reply:
-        # Extract event hint after the marker
-        marker_line = ""
-        clean_lines = []
-        for line in reply.split("\n"):
-            if "ЗАПИСЬ_ТРЕБУЕТСЯ" in line:
-                marker_line = line.split("ЗАПИСЬ_ТРЕБУЕТСЯ")[-1].strip(": ")
-            else:
-                clean_lines.append(line)
+    marker = _MARKER_RE.search(reply)
+    if marker:
+        # Event hint after the marker; the rest of the reply stays as text
+        marker_line = marker.group(1).strip(": ")
+        clean_reply = (reply[:marker.start()] + reply[marker.end():]).strip()
 
         events = await db.get_active_events()
         if events:
@@ -150,17 +221,17 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 )]
                 for e in events
             ]
-            text_reply = "\n".join(clean_lines).strip() or "Выберите мероприятие для записи:"
-            await update.message.reply_text(
+            text_reply = clean_reply or "Выберите мероприятие для записи:"
+            await placeholder.edit_text(
                 text_reply,
                 reply_markup=InlineKeyboardMarkup(buttons),
             )
         else:
-            await update.message.reply_text(
+            await placeholder.edit_text(
                 "Сейчас нет активных мероприятий для записи."
             )
-    else:
-        await update.message.reply_text(reply)
+    elif reply.strip() and reply.strip() != shown:
+        await placeholder.edit_text(reply.strip())
 
 
 # ---------------------------------------------------------------------------
@@ -27,7 +27,7 @@ class RequestStatus(str, enum.Enum):
     REJECTED = "rejected"
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     telegram_id: int
     username: Optional[str]
@@ -37,7 +37,7 @@ class User:
     created_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     id: int
     title: str
@@ -53,7 +53,7 @@ class Event:
     created_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EventRegistration:
     id: int
     event_id: int
@@ -66,7 +66,7 @@ class EventRegistration:
     registered_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AdminRequest:
     id: int
     username: str
@@ -0,0 +1,112 @@
+"""Redis-backed persistence for PTB — shared state across processes/restarts."""
+
+from __future__ import annotations
+
+import pickle
+from typing import Optional
+
+from redis import asyncio as aioredis
+from telegram.ext import BasePersistence, PersistenceInput
+
+
+def _dumps(obj) -> bytes:
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _loads(raw: Optional[bytes]):
+    return pickle.loads(raw) if raw else None
+
+
+class RedisPersistence(BasePersistence):
+    """Keep conversation/user/chat state in Redis instead of the process.
+
+    With in-process state the bot cannot run more than one worker without
+    losing conversations mid-flow; this moves the state behind Redis so
+    workers share it and restarts don't drop it. Values are pickled:
+    handlers stash dataclasses (``db_user``, ``reg_event``) and dates in
+    ``user_data``, which must come back as the same types. The Redis
+    instance only ever holds data this bot wrote, so unpickling it is as
+    trusted as reading our own memory.
+
+    Only active when REDIS_URL is configured — see ``bot.main``.
+    """
+
+    def __init__(self, redis_url: str, update_interval: float = 60) -> None:
+        super().__init__(
+            # Telegram forbids answering stale callback queries anyway —
+            # not worth persisting them.
+            store_data=PersistenceInput(callback_data=False),
+            update_interval=update_interval,
+        )
+        self._redis = aioredis.from_url(redis_url)
+
+    # --- bot_data -----------------------------------------------------------
+
+    async def get_bot_data(self) -> dict:
+        return _loads(await self._redis.get("ptb:bot_data")) or {}
+
+    async def update_bot_data(self, data: dict) -> None:
+        await self._redis.set("ptb:bot_data", _dumps(data))
+
+    async def refresh_bot_data(self, bot_data: dict) -> None:
+        pass
+
+    # --- user_data / chat_data ----------------------------------------------
+
+    async def _get_keyed(self, prefix: str) -> dict[int, dict]:
+        out: dict[int, dict] = {}
+        async for key in self._redis.scan_iter(match=f"{prefix}*"):
+            raw = await self._redis.get(key)
+            if raw:
+                out[int(key.rsplit(b":", 1)[-1])] = _loads(raw)
+        return out
+
+    async def get_user_data(self) -> dict[int, dict]:
+        return await self._get_keyed("ptb:u:")
+
+    async def update_user_data(self, user_id: int, data: dict) -> None:
+        await self._redis.set(f"ptb:u:{user_id}", _dumps(data))
+
+    async def refresh_user_data(self, user_id: int, user_data: dict) -> None:
+        pass
+
+    async def drop_user_data(self, user_id: int) -> None:
+        await self._redis.delete(f"ptb:u:{user_id}")
+
+    async def get_chat_data(self) -> dict[int, dict]:
+        return await self._get_keyed("ptb:c:")
+
+    async def update_chat_data(self, chat_id: int, data: dict) -> None:
+        await self._redis.set(f"ptb:c:{chat_id}", _dumps(data))
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: dict) -> None:
+        pass
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        await self._redis.delete(f"ptb:c:{chat_id}")
+
+    # --- callback_data (disabled via store_data) ------------------------------
+
+    async def get_callback_data(self):
+        return None
+
+    async def update_callback_data(self, data) -> None:
+        pass
+
+    # --- conversations --------------------------------------------------------
+
+    async def get_conversations(self, name: str) -> dict:
+        # Pickle keeps the tuple keys as-is — no key re-encoding needed.
+        return _loads(await self._redis.get(f"ptb:conv:{name}")) or {}
+
+    async def update_conversation(self, name: str, key, new_state) -> None:
+        rkey = f"ptb:conv:{name}"
+        convs = _loads(await self._redis.get(rkey)) or {}
+        if new_state is None:
+            convs.pop(key, None)
+        else:
+            convs[key] = new_state
+        await self._redis.set(rkey, _dumps(convs))
+
+    async def flush(self) -> None:
+        await self._redis.aclose()
@@ -4,16 +4,44 @@ from __future__ import annotations
 
 import functools
 import logging
+import time
 from typing import Callable
 
 from telegram import Update
 from telegram.ext import ContextTypes
 
 import db
-from models import UserRole
+from models import User, UserRole
 
 logger = logging.getLogger(__name__)
 
+# Short-TTL user cache: a burst of updates from the same person (every
+# decorated handler plus handle_message) would otherwise re-SELECT the same
+# row. db.upsert_user / role changes call invalidate() to keep it honest.
+_USER_CACHE: dict[int, tuple[float, User]] = {}
+_USER_TTL = 30.0  # seconds
+_USER_CACHE_MAX = 10_000
+
+
+async def get_cached_user(telegram_id: int) -> User | None:
+    entry = _USER_CACHE.get(telegram_id)
+    if entry is not None and time.monotonic() - entry[0] < _USER_TTL:
+        return entry[1]
+    user = await db.get_user(telegram_id)
+    if user is not None:
+        if len(_USER_CACHE) >= _USER_CACHE_MAX:
+            _USER_CACHE.clear()
+        _USER_CACHE[telegram_id] = (time.monotonic(), user)
+    return user
+
+
+def invalidate(telegram_id: int | None = None) -> None:
+    """Drop one cached user (or all) after a write to the users table."""
+    if telegram_id is None:
+        _USER_CACHE.clear()
+    else:
+        _USER_CACHE.pop(telegram_id, None)
+
 
 def require_role(*allowed: UserRole) -> Callable:
     """Decorator: only allow users whose DB role is in *allowed*."""
@@ -29,7 +57,7 @@ def require_role(*allowed: UserRole) -> Callable:
             if not user_tg:
                 return
 
-            db_user = await db.get_user(user_tg.id)
+            db_user = await get_cached_user(user_tg.id)
             if db_user is None:
                 await update.effective_message.reply_text(
                     "Пожалуйста, сначала отправьте /start чтобы зарегистрироваться."
@@ -50,7 +78,7 @@ def require_role(*allowed: UserRole) -> Callable:
 
 
 async def is_admin_or_above(telegram_id: int) -> bool:
-    user = await db.get_user(telegram_id)
+    user = await get_cached_user(telegram_id)
     return user is not None and user.role in (UserRole.ADMIN, UserRole.SUPER_ADMIN)
 
 
@@ -0,0 +1,103 @@
+"""Semantic response cache — serve repeat questions without a Claude call.
+
+Users ask the same FAQs in slightly different words («когда служение?»,
+«во сколько собрание?»). Instead of a full LLM round-trip for each
+near-duplicate, cached answers are matched by cosine similarity over
+character-trigram vectors of the normalized question. Trigram vectors are
+a deliberately lightweight stand-in for sentence embeddings: no model
+download, no extra dependency, and robust to inflection-heavy Russian.
+Unlike embeddings they can't tell «в субботу» from «в воскресенье» by
+cosine alone, so a hit additionally requires the same word set — only
+reorderings and punctuation/case variants of a cached question match.
+
+Entries are namespaced by a hash of the current Claude context, so the
+cache self-invalidates whenever events/info in the DB change, and expire
+after a TTL regardless.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import time
+from collections import Counter, OrderedDict
+
+# Similarity threshold: below this, the question is treated as new.
+SIMILARITY_THRESHOLD = 0.95
+
+# Entries older than this are ignored and evicted lazily.
+TTL = 3600.0  # seconds
+
+# Bound on stored entries; oldest evicted first.
+_MAX_ENTRIES = 512
+
+# key -> (trigram vector, norm, word set, response text, monotonic timestamp)
+_entries: OrderedDict[
+    str, tuple[Counter, float, frozenset[str], str, float]
+] = OrderedDict()
+
+
+_PUNCT_RE = re.compile(r"[^\w\s]+")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_PUNCT_RE.sub(" ", text.lower()).split())
+
+
+def _vectorize(text: str) -> tuple[Counter, float]:
+    """Character-trigram count vector and its Euclidean norm."""
+    padded = f"  {_normalize(text)}  "
+    vec = Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+    norm = math.sqrt(sum(c * c for c in vec.values()))
+    return vec, norm
+
+
+def _cosine(a: Counter, na: float, b: Counter, nb: float) -> float:
+    if not na or not nb:
+        return 0.0
+    # Iterate the smaller vector
+    if len(b) < len(a):
+        a, b = b, a
+    dot = sum(c * b[t] for t, c in a.items())
+    return dot / (na * nb)
+
+
+def namespace_for(context: str) -> str:
+    """Derive a cache namespace from the current Claude context string."""
+    return hashlib.blake2b(context.encode(), digest_size=8).hexdigest()
+
+
+def get(message: str, namespace: str) -> str | None:
+    """Return a cached response for a near-duplicate of *message*, if any."""
+    now = time.monotonic()
+    vec, norm = _vectorize(message)
+    tokens = frozenset(_normalize(message).split())
+    best: str | None = None
+    best_sim = SIMILARITY_THRESHOLD
+    for key, (evec, enorm, etokens, response, ts) in list(_entries.items()):
+        if now - ts > TTL:
+            del _entries[key]
+            continue
+        if not key.startswith(namespace):
+            continue
+        # Token guard: trigram cosine alone scores one-word differences
+        # («суббота»/«воскресенье») too high to trust.
+        if etokens != tokens:
+            continue
+        sim = _cosine(vec, norm, evec, enorm)
+        if sim >= best_sim:
+            best_sim = sim
+            best = response
+    return best
+
+
+def put(message: str, namespace: str, response: str) -> None:
+    """Store a fresh Claude response for *message*."""
+    vec, norm = _vectorize(message)
+    tokens = frozenset(_normalize(message).split())
+    key = f"{namespace}:{hashlib.blake2b(_normalize(message).encode(), digest_size=8).hexdigest()}"
+    _entries[key] = (vec, norm, tokens, response, time.monotonic())
+    _entries.move_to_end(key)
+    while len(_entries) > _MAX_ENTRIES:
+        _entries.popitem(last=False)
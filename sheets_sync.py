@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
 from datetime import date, datetime
 
 import gspread
@@ -27,17 +29,68 @@ def _get_sheets_client() -> gspread.Client:
     return gspread.authorize(creds)
 
 
-def _serialize(val) -> str:
-    """Convert a value to a string suitable for Google Sheets."""
-    if val is None:
-        return ""
-    if isinstance(val, datetime):
-        return val.isoformat()
-    if isinstance(val, date):
-        return val.isoformat()
-    if isinstance(val, dict):
-        return json.dumps(val, ensure_ascii=False)
-    return str(val)
+# Authorization does an OAuth token exchange and open_by_key another HTTP
+# round-trip; tokens live ~3600s, so reuse the handle just under that and
+# serialize rebuilds behind a lock for concurrent exports.
+_SPREADSHEET: gspread.Spreadsheet | None = None
+_SPREADSHEET_TS = 0.0
+_SPREADSHEET_TTL = 3000.0  # seconds
+_spreadsheet_lock = asyncio.Lock()
+
+
+def _open_spreadsheet() -> gspread.Spreadsheet:
+    """Authorize and open the target spreadsheet (sync — run on a thread)."""
+    return _get_sheets_client().open_by_key(GOOGLE_SHEETS_ID)
+
+
+async def _cached_spreadsheet() -> gspread.Spreadsheet:
+    global _SPREADSHEET, _SPREADSHEET_TS
+    async with _spreadsheet_lock:
+        if (
+            _SPREADSHEET is None
+            or time.monotonic() - _SPREADSHEET_TS >= _SPREADSHEET_TTL
+        ):
+            _SPREADSHEET = await asyncio.to_thread(_open_spreadsheet)
+            _SPREADSHEET_TS = time.monotonic()
+        return _SPREADSHEET
+
+
+# Converter per Python type, picked once per column instead of an
+# isinstance chain per cell (a 10k-row, 12-col export is 120k cells).
+_CONVERTERS = {
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+    dict: lambda d: json.dumps(d, ensure_ascii=False),
+}
+
+
+def _column_converter(rows, idx):
+    """Pick a converter from the first non-NULL value in column *idx*."""
+    for r in rows:
+        val = r[idx]
+        if val is not None:
+            return _CONVERTERS.get(type(val), str)
+    return str
+
+
+def _rows_to_values(header: list[str], rows) -> list[list[str]]:
+    """Header row + records serialized positionally.
+
+    The SELECT lists exactly the header columns in order, so each record
+    iterates by position — no per-cell name hashing. Each column gets one
+    converter chosen up front from its value type, so the hot loop is a
+    plain call per cell with only a NULL check.
+    """
+    if not rows:
+        return [header]
+    convs = [_column_converter(rows, i) for i in range(len(header))]
+    return [
+        header,
+        *(
+            ["" if v is None else conv(v) for conv, v in zip(convs, r)]
+            for r in rows
+        ),
+    ]
 
 
 async def export_all() -> str:
@@ -48,63 +101,90 @@ async def export_all() -> str:
     if not GOOGLE_SHEETS_ID or not GOOGLE_CREDENTIALS_JSON:
         return "Google Sheets не настроен (нет GOOGLE_SHEETS_ID или GOOGLE_CREDENTIALS_JSON)."
 
-    gc = _get_sheets_client()
-    sh = gc.open_by_key(GOOGLE_SHEETS_ID)
+    sh = await _cached_spreadsheet()
+
+    # The four tables are independent — fetch and render them concurrently
+    # on separate pool connections. Writes are already coalesced into one
+    # batchUpdate, so the fetch phase was the remaining sequential part.
+    parts = await asyncio.gather(
+        _collect_users(), _collect_events(),
+        _collect_registrations(), _collect_info(),
+    )
+    # Worksheet title -> rows (header first)
+    sheets = {title: values for title, values in parts}
+    counts = {title: len(values) - 1 for title, values in parts}
+
+    # gspread is synchronous — run the HTTP push phase on a worker thread
+    # so the multi-second Sheets round-trips don't stall the event loop.
+    await asyncio.to_thread(_push_sheets, sh, sheets)
+
+    summary = ", ".join(f"{k}: {v}" for k, v in counts.items())
+    logger.info("Exported to Google Sheets: %s", summary)
+    return f"Экспорт завершён. {summary}"
 
-    counts: dict[str, int] = {}
 
-    # --- Users ---
-    users = await db.get_all_users()
-    _write_sheet(sh, "Users", [
-        ["telegram_id", "username", "full_name", "phone", "role", "created_at"],
-        *[[_serialize(u.telegram_id), u.username or "", u.full_name,
-           u.phone or "", u.role.value, _serialize(u.created_at)] for u in users],
-    ])
-    counts["Users"] = len(users)
+async def _collect_users() -> tuple[str, list[list[str]]]:
+    # Raw records like the other tables — the export only stringifies
+    # fields, so building a User dataclass per row is wasted work.
+    header = ["telegram_id", "username", "full_name", "phone", "role",
+              "created_at"]
+    rows = await db.pool.fetch(
+        f"SELECT {', '.join(header)} FROM users ORDER BY telegram_id"
+    )
+    return "Users", _rows_to_values(header, rows)
+
 
-    # --- Events ---
-    rows_events = await db.pool.fetch("SELECT * FROM events ORDER BY id")
+async def _collect_events() -> tuple[str, list[list[str]]]:
     header = ["id", "title", "type", "date_start", "date_end", "time",
               "place", "description", "max_participants", "status",
               "created_by", "created_at"]
-    _write_sheet(sh, "Events", [
-        header,
-        *[[_serialize(r[h]) for h in header] for r in rows_events],
-    ])
-    counts["Events"] = len(rows_events)
+    rows = await db.pool.fetch(
+        f"SELECT {', '.join(header)} FROM events ORDER BY id"
+    )
+    return "Events", _rows_to_values(header, rows)
 
-    # --- Registrations ---
-    rows_reg = await db.pool.fetch(
-        "SELECT * FROM event_registrations ORDER BY id"
+
+async def _collect_registrations() -> tuple[str, list[list[str]]]:
+    header = ["id", "event_id", "username", "telegram_id", "full_name",
+              "phone", "level", "comment", "registered_at"]
+    rows = await db.pool.fetch(
+        f"SELECT {', '.join(header)} FROM event_registrations ORDER BY id"
     )
-    header_r = ["id", "event_id", "username", "telegram_id", "full_name",
-                "phone", "level", "comment", "registered_at"]
-    _write_sheet(sh, "Registrations", [
-        header_r,
-        *[[_serialize(r[h]) for h in header_r] for r in rows_reg],
-    ])
-    counts["Registrations"] = len(rows_reg)
-
-    # --- Info ---
-    rows_info = await db.pool.fetch("SELECT * FROM info ORDER BY id")
-    header_i = ["id", "category", "title", "content", "updated_at"]
-    _write_sheet(sh, "Info", [
-        header_i,
-        *[[_serialize(r[h]) for h in header_i] for r in rows_info],
-    ])
-    counts["Info"] = len(rows_info)
+    return "Registrations", _rows_to_values(header, rows)
 
-    summary = ", ".join(f"{k}: {v}" for k, v in counts.items())
-    logger.info("Exported to Google Sheets: %s", summary)
-    return f"Экспорт завершён. {summary}"
+
+async def _collect_info() -> tuple[str, list[list[str]]]:
+    header = ["id", "category", "title", "content", "updated_at"]
+    rows = await db.pool.fetch(
+        f"SELECT {', '.join(header)} FROM info ORDER BY id"
+    )
+    return "Info", _rows_to_values(header, rows)
 
 
-def _write_sheet(sh: gspread.Spreadsheet, title: str, data: list[list[str]]) -> None:
-    """Write data to a worksheet, creating it if necessary."""
-    try:
-        ws = sh.worksheet(title)
-    except gspread.WorksheetNotFound:
-        ws = sh.add_worksheet(title=title, rows=max(len(data), 1), cols=len(data[0]) if data else 1)
-    ws.clear()
-    if data:
-        ws.update(range_name="A1", values=data)
+def _push_sheets(sh: gspread.Spreadsheet, sheets: dict[str, list[list[str]]]) -> None:
+    """Write all worksheets with one batch clear + one batch update.
+
+    Per-worksheet clear/write pairs cost an HTTP round-trip each and eat
+    into the Sheets API write quota; one batchClear plus one batchUpdate
+    covers every range in two calls total. Missing worksheets are still
+    created individually, but that only happens on first export.
+    """
+    for title, data in sheets.items():
+        try:
+            sh.worksheet(title)
+        except gspread.WorksheetNotFound:
+            sh.add_worksheet(
+                title=title,
+                rows=max(len(data), 1),
+                cols=len(data[0]) if data else 1,
+            )
+
+    sh.values_batch_clear(body={"ranges": [f"'{title}'" for title in sheets]})
+    sh.values_batch_update(body={
+        "valueInputOption": "RAW",
+        "data": [
+            {"range": f"'{title}'!A1", "values": data}
+            for title, data in sheets.items()
+            if data
+        ],
+    })